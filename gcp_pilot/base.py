@@ -1,12 +1,21 @@
 import abc
+import hashlib
+import inspect
 import json
 import logging
 import os
-from collections.abc import Callable, Generator
-from functools import cached_property
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Generator, Hashable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
+from pathlib import Path
 from typing import Any
 
 import google.auth.transport._http_client
+import google_auth_httplib2
 from google import auth
 from google.auth import iam
 from google.auth.credentials import Credentials
@@ -14,8 +23,11 @@ from google.auth.impersonated_credentials import Credentials as ImpersonatedCred
 from google.auth.transport import requests
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.protobuf.duration_pb2 import Duration
-from googleapiclient.discovery import Resource, build
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import Resource, build, build_from_document
+from googleapiclient.discovery_cache.base import Cache
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
 from requests import HTTPError, Response
 
 from gcp_pilot import exceptions
@@ -23,6 +35,8 @@ from gcp_pilot import exceptions
 DEFAULT_PROJECT = os.environ.get("GCP_PROJECT", None)
 DEFAULT_LOCATION = os.environ.get("GCP_LOCATION", None)
 DEFAULT_SERVICE_ACCOUNT = os.environ.get("GCP_SERVICE_ACCOUNT", None)
+DISCOVERY_CACHE_DIR = Path(os.environ.get("GCP_DISCOVERY_CACHE_DIR", "~/.cache/gcp-pilot")).expanduser()
+DISCOVERY_CACHE_TTL = int(os.environ.get("GCP_DISCOVERY_CACHE_TTL", "86400"))  # 1 day
 
 TOKEN_URI = "https://accounts.google.com/o/oauth2/token"
 
@@ -33,6 +47,8 @@ ResourceType = dict[str, Any]
 
 logger = logging.getLogger()
 
+MAX_BATCH_SIZE = 1000  # max calls allowed in a single batch request
+
 _CACHED_LOCATIONS = {}  # TODO: Implement a smarter solution for caching project's location
 
 
@@ -41,8 +57,100 @@ MINIMAL_SCOPES = [
 ]
 
 
+class DiscoveryCache(Cache):
+    # Discovery documents fetched over the network are kept in memory and on disk,
+    # so only the first client of the day pays for the download
+    def __init__(self, directory: Path = DISCOVERY_CACHE_DIR, ttl: int = DISCOVERY_CACHE_TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self._documents: dict[str, str] = {}
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> str | None:
+        if url not in self._documents:
+            path = self._path(url=url)
+            try:
+                if time.time() - path.stat().st_mtime > self.ttl:
+                    return None
+                self._documents[url] = path.read_text()
+            except OSError:
+                return None
+        return self._documents[url]
+
+    def set(self, url: str, content: str) -> None:
+        self._documents[url] = content
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=self.directory, delete=False) as file:
+                file.write(content)
+            Path(file.name).replace(self._path(url=url))
+        except OSError as exc:  # eg. read-only file systems
+            logger.debug(f"Unable to cache discovery document of {url}: {exc}")
+
+
+_discovery_cache = DiscoveryCache()
+
+
+@lru_cache
+def _get_static_discovery_document(service_name: str, version: str) -> ResourceType | None:
+    content = discovery_cache.get_static_doc(service_name, version)
+    return json.loads(content) if content else None
+
+
+def _build_discovery_client(
+    serviceName: str,
+    version: str,
+    static_discovery: bool | None = None,
+    cache_discovery: bool = True,
+    **kwargs,
+) -> Resource:
+    # Parsing the discovery document is most of the cost of building a client,
+    # so the parsed documents shipped with googleapiclient are shared by every client in the process
+    if static_discovery is not False and "discoveryServiceUrl" not in kwargs:
+        document = _get_static_discovery_document(service_name=serviceName, version=version)
+        if document:
+            kwargs.pop("cache", None)
+            kwargs.pop("num_retries", None)
+            return build_from_document(document, **kwargs)
+
+    if cache_discovery:
+        kwargs.setdefault("cache", _discovery_cache)
+    return build(
+        serviceName=serviceName,
+        version=version,
+        static_discovery=static_discovery,
+        cache_discovery=cache_discovery,
+        **kwargs,
+    )
+
+
+def _map_concurrently(func: Callable, items: dict[Hashable, Any], max_workers: int) -> dict[Hashable, Any]:
+    # Every call runs to the end, so a failure never hides which of the other calls went through
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(func, item): key for key, item in items.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as exc:
+                errors[key] = exc
+
+    if errors:
+        raise exceptions.BatchError(errors=errors, results=results)
+    return {key: results[key] for key in items}
+
+
+@lru_cache(maxsize=32)
+def _get_grpc_transport(client_class: type, credentials: Credentials) -> Any:
+    return client_class.get_transport_class("grpc")(credentials=credentials)
+
+
 class GoogleCloudPilotAPI(abc.ABC):
     _client_class = None
+    _share_transport = False  # Reuse one gRPC channel among clients with the same credentials
     _scopes: list[str] = []
     _iam_roles: list[str] = []
     _cached_credentials: AuthType | None = None
@@ -73,6 +181,26 @@ class GoogleCloudPilotAPI(abc.ABC):
 
         self._location = location or DEFAULT_LOCATION
 
+    @classmethod
+    @lru_cache
+    def get_default(cls) -> "GoogleCloudPilotAPI":
+        # One shared client per class, built with the default credentials, project and location.
+        # Clients are safe to share across threads, so code that would build one per request can reuse it
+        required = [
+            name
+            for name, param in inspect.signature(cls).parameters.items()
+            if param.default is param.empty and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+        ]
+        if required:
+            raise exceptions.NotAllowed(
+                f"{cls.__name__} has no default client, since it requires {', '.join(required)}"
+            )
+        return cls()
+
+    def _as_bytes(self, payload: str | bytes) -> bytes:
+        # Request bodies (eg. of tasks and scheduled jobs) accept both text and raw bytes
+        return payload if isinstance(payload, bytes) else payload.encode()
+
     def _refresh_credentials(self):
         self.credentials.refresh(request=google.auth.transport.requests.Request())
 
@@ -105,7 +233,13 @@ class GoogleCloudPilotAPI(abc.ABC):
     def _build_client(self, **kwargs) -> Resource | _client_class:
         kwargs.update(self._get_client_extra_kwargs())
 
-        return (self._client_class or build)(credentials=self.credentials, **kwargs)
+        if self._client_class:
+            if self._share_transport and "transport" not in kwargs and "client_options" not in kwargs:
+                # A channel multiplexes concurrent RPCs, so short-lived clients skip the TLS and HTTP/2 handshake
+                transport = _get_grpc_transport(client_class=self._client_class, credentials=self.credentials)
+                return self._client_class(transport=transport, **kwargs)
+            return self._client_class(credentials=self.credentials, **kwargs)
+        return _build_discovery_client(credentials=self.credentials, **kwargs)
 
     def _set_project_id(self, project_id: str, credential_project_id: str) -> str:
         return project_id or DEFAULT_PROJECT or credential_project_id
@@ -217,7 +351,7 @@ class GoogleCloudPilotAPI(abc.ABC):
     def set_up_permissions(self, email: str, project_id: str | None = None) -> None:
         from gcp_pilot.resource import ResourceManager, ServiceAgent
 
-        rm = ResourceManager()
+        rm = ResourceManager.get_default()
         for role in self._iam_roles:
             rm.add_member(
                 email=email,
@@ -231,7 +365,7 @@ class GoogleCloudPilotAPI(abc.ABC):
                 project_id=self.project_id,
             )
 
-            ResourceManager().allow_impersonation(
+            rm.allow_impersonation(
                 email=email,
                 project_id=project_id,
             )
@@ -239,7 +373,7 @@ class GoogleCloudPilotAPI(abc.ABC):
     def _get_project_number(self, project_id: str) -> int:
         from gcp_pilot.resource import ResourceManager
 
-        project = ResourceManager().get_project(project_id=project_id)
+        project = ResourceManager.get_default().get_project(project_id=project_id)
         return project["projectNumber"]
 
     def _as_duration(self, seconds) -> Duration:
@@ -253,17 +387,22 @@ class GoogleCloudPilotAPI(abc.ABC):
         )
 
     def _get_project_default_location(self, project_id: str | None = None) -> str | None:
-        location = _CACHED_LOCATIONS.get(project_id or self.project_id, None)
-        if location:
-            return location
+        project_id = project_id or self.project_id
+        if project_id in _CACHED_LOCATIONS:
+            return _CACHED_LOCATIONS[project_id]
 
         from gcp_pilot.app_engine import AppEngine
 
+        app_engine = AppEngine.build_from(client=self, project_id=project_id)
         try:
-            app_engine = AppEngine.build_from(client=self, project_id=project_id)
+            location = app_engine._get_default_location()
         except exceptions.NotFound:
+            # Without an App Engine app there's no location yet, but one can still be created later
             return None
-        return app_engine.location
+
+        # Once set, a project's default location never changes
+        _CACHED_LOCATIONS[project_id] = location
+        return location
 
     def _project_path(self, project_id: str | None = None) -> str:
         return f"projects/{project_id or self.project_id}"
@@ -406,16 +545,83 @@ def friendly_http_error(func):
     return inner_function
 
 
+class DiscoveryBatch:
+    # Collects calls made with `batch=` so they are sent together; responses are keyed by the returned request id
+    def __init__(self):
+        self.calls: dict[str, HttpRequest] = {}
+        self.responses: dict[str, ResourceType] = {}
+
+    def add(self, call: HttpRequest) -> str:
+        request_id = str(len(self.calls))
+        self.calls[request_id] = call
+        return request_id
+
+
 class DiscoveryMixin:
     @friendly_http_error
-    def _execute(self, method: Callable, method_http_headers=None, **kwargs) -> ResourceType:
+    def _execute(
+        self,
+        method: Callable,
+        method_http_headers=None,
+        batch: DiscoveryBatch | None = None,
+        **kwargs,
+    ) -> ResourceType | str:
         call = method(**kwargs)
         if isinstance(call, Response):
             call.raise_for_status()
             return call.json()
         if method_http_headers:
             call.headers = (call.headers or {}) | method_http_headers
-        return call.execute()
+        if batch is not None:
+            return batch.add(call=call)
+        return call.execute(http=self._thread_http)
+
+    @contextmanager
+    def batch(self) -> Generator[DiscoveryBatch]:
+        # eg. `with sql.batch() as batch: sql.create_user(..., batch=batch)`; calls are executed when the block exits
+        batch = DiscoveryBatch()
+        yield batch
+        if batch.calls:
+            batch.responses = self._execute_batch(calls=batch.calls)
+
+    @friendly_http_error
+    def _execute_batch(self, calls: dict[str, HttpRequest]) -> dict[str, ResourceType]:
+        # Sends the calls (eg. `self.client.sslCerts().delete(...)`) as one HTTP request per MAX_BATCH_SIZE calls.
+        # If any call fails, a BatchError carries the errors and the successful responses by request id
+        responses, errors = {}, {}
+
+        def callback(request_id: str, response: ResourceType, exception: HttpError | None) -> None:
+            if exception:
+                errors[request_id] = exception
+            else:
+                responses[request_id] = response
+
+        request_ids = list(calls)
+        for start in range(0, len(request_ids), MAX_BATCH_SIZE):
+            batch = self.client.new_batch_http_request(callback=callback)
+            for request_id in request_ids[start : start + MAX_BATCH_SIZE]:
+                batch.add(calls[request_id], request_id=request_id)
+            batch.execute(http=self._thread_http)
+
+        if errors:
+            raise exceptions.BatchError(errors=errors, results=responses)
+        return responses
+
+    @cached_property
+    def _thread_local(self) -> threading.local:
+        return threading.local()
+
+    @property
+    def _thread_http(self) -> google_auth_httplib2.AuthorizedHttp:
+        # httplib2 is not thread-safe, so each thread gets its own authorized transport
+        # and a single discovery client can be shared across threads (eg. `asyncio.to_thread` or thread pools)
+        http = getattr(self._thread_local, "http", None)
+        if http is None:
+            # The client's own transport holds the credentials already scoped for this API
+            credentials = getattr(self.client._http, "credentials", self.credentials)
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+            self._thread_local.http = http
+        return http
 
     def _list(
         self,
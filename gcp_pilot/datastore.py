@@ -3,17 +3,16 @@ from __future__ import annotations
 import abc
 import inspect
 import itertools
-import json
 import os
 from collections import defaultdict
 from collections.abc import Callable, Generator, Iterable
 from dataclasses import dataclass
-from datetime import date, datetime
-from functools import cached_property
-from typing import Any, ClassVar
+from datetime import date
+from functools import cached_property, lru_cache
+from typing import Any, ClassVar, get_args
 
 from google.cloud import datastore
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_serializer
 
 from gcp_pilot import exceptions
 
@@ -29,6 +28,12 @@ def _chunks(lst, n):
         yield lst[i : i + n]
 
 
+@lru_cache(maxsize=32)
+def _get_client(namespace: str | None) -> datastore.Client:
+    # Documents of the same namespace share a client, instead of each kind opening its own channel
+    return datastore.Client(namespace=namespace)
+
+
 @dataclass
 class DoesNotExist(Exception):
     cls: type[EmbeddedDocument]
@@ -41,6 +46,13 @@ class MultipleObjectsFound(Exception):
     filters: dict
 
 
+def _is_embedded(annotation) -> bool:
+    # Embedded documents can also be optional or in a list
+    if inspect.isclass(annotation):
+        return issubclass(annotation, EmbeddedDocument)
+    return any(_is_embedded(arg) for arg in get_args(annotation))
+
+
 def _starts_with_operator(lookup_fields, value) -> list[tuple[str, str, Any]]:
     field_name = ".".join(lookup_fields)
     return [
@@ -64,15 +76,15 @@ class Manager:
 
     @cached_property
     def client(self) -> datastore.Client:
-        return datastore.Client(namespace=self.namespace)
+        return _get_client(namespace=self.namespace)
 
     @property
-    def namespace(self) -> str:
-        return getattr(self.doc_klass.__config__, "namespace", ())
+    def namespace(self) -> str | None:
+        return self.doc_klass.model_config.get("namespace")
 
     @property
     def exclude_from_indexes(self):
-        return getattr(self.doc_klass.__config__, "exclude_from_indexes", ())
+        return self.doc_klass.model_config.get("exclude_from_indexes", ())
 
     @property
     def kind(self) -> str:
@@ -84,7 +96,7 @@ class Manager:
 
     @property
     def fields(self) -> Iterable[str]:
-        return self.doc_klass.__fields__.keys()
+        return self.doc_klass.model_fields.keys()
 
     def build_key(self, pk: Any | None = None) -> datastore.Key:
         if self.is_embedded:
@@ -96,26 +108,25 @@ class Manager:
         # If no primary key is provided, we let the server create a new ID
         return self.client.allocate_ids(self.client.key(self.kind), 1)[0]
 
-    def _iterate(self, query, page_size: int = 10):
+    def _iterate(self, query, page_size: int | None = 10):
+        # Without a page size, each request returns as many entities as the server fits in a batch
         cursor = None
-        empty = False
-
-        while not empty:
+        while True:
             query_iter = query.fetch(start_cursor=cursor, limit=page_size)
 
             page = next(query_iter.pages, [])
             yield from page
             next_cursor = query_iter.next_page_token
-            empty = not bool(cursor) or cursor == next_cursor
+            if not next_cursor or next_cursor == cursor:
+                break
             cursor = next_cursor
 
-    def query(
+    def _build_query(
         self,
         distinct_on: str | None = None,
         order_by: str | list[str] | None = None,
-        page_size: int | None = None,
         **kwargs,
-    ) -> datastore.query.Iterator:
+    ) -> tuple[datastore.Query, list[tuple[str, str, Any]]]:
         # base query
         query = self.client.query(kind=self.kind)
         if order_by:
@@ -132,7 +143,24 @@ class Manager:
                     cross_filters.append((field_name, operator, field_value))
                 else:
                     query.add_filter(field_name, operator, field_value)
+        return query, cross_filters
+
+    def query(
+        self,
+        distinct_on: str | None = None,
+        order_by: str | list[str] | None = None,
+        page_size: int | None = None,
+        **kwargs,
+    ) -> datastore.query.Iterator:
+        query, cross_filters = self._build_query(distinct_on=distinct_on, order_by=order_by, **kwargs)
+        yield from self._run_query(query=query, cross_filters=cross_filters, page_size=page_size)
 
+    def _run_query(
+        self,
+        query: datastore.Query,
+        cross_filters: list[tuple[str, str, Any]],
+        page_size: int | None = None,
+    ) -> datastore.query.Iterator:
         if not cross_filters:
             yield from self._iterate(query=query, page_size=page_size)
         else:
@@ -159,6 +187,17 @@ class Manager:
         for entity in self.query(**kwargs):
             yield self.doc_klass.from_entity(entity=entity)
 
+    def count(self, page_size: int | None = None, **kwargs) -> int:
+        query, cross_filters = self._build_query(**kwargs)
+        if cross_filters:
+            # The combinations of `in` values can match the same entity more than once, so only iterating dedupes them
+            return sum(1 for _ in self._run_query(query=query, cross_filters=cross_filters, page_size=page_size))
+
+        # The server counts the entities, instead of sending all of them to be counted here
+        aggregation_query = self.client.aggregation_query(query).count(alias="count")
+        results = next(iter(aggregation_query.fetch()), [])
+        return results[0].value if results else 0
+
     def get(self, **kwargs) -> Document:
         if DEFAULT_PK_FIELD_NAME in kwargs:
             pk = kwargs[DEFAULT_PK_FIELD_NAME]
@@ -188,6 +227,21 @@ class Manager:
             setattr(obj, DEFAULT_PK_FIELD_NAME, entity.id)
         return obj
 
+    def create_many(self, items: Iterable[dict[str, Any]]) -> list[Document]:
+        # Each item is a dict of `create` arguments: new IDs are allocated at once and entities written in chunks
+        objs = [self.doc_klass(**item) for item in items]
+
+        new_objs = [obj for obj in objs if not obj.pk]
+        if new_objs:
+            keys = self.client.allocate_ids(self.client.key(self.kind), len(new_objs))
+            for obj, key in zip(new_objs, keys, strict=True):
+                setattr(obj, DEFAULT_PK_FIELD_NAME, key.id)
+
+        entities = [obj.to_entity() for obj in objs]
+        for chunk in _chunks(entities, MAX_ITEMS_PER_OPERATIONS):
+            self.client.put_multi(entities=chunk)
+        return objs
+
     def update(self, pk: str, **kwargs) -> Document:
         if kwargs:
             entity = self.client.get(key=self.build_key(pk=pk))
@@ -203,7 +257,10 @@ class Manager:
         if pk:
             self.client.delete(key=self.build_key(pk=pk))
         else:
-            keys = [entity.key for entity in self.query()]
+            # Only the keys are needed, so the entities are fetched without their properties
+            query, _ = self._build_query()
+            query.keys_only()
+            keys = [entity.key for entity in self._iterate(query=query, page_size=None)]
             for chunk in _chunks(keys, MAX_ITEMS_PER_OPERATIONS):
                 self.client.delete_multi(keys=chunk)
 
@@ -231,10 +288,11 @@ class Manager:
 
 
 class EmbeddedDocument(BaseModel, abc.ABC):
-    class Config:
-        arbitrary_types_allowed = True
-        use_enum_values = True
-        keep_untouched = (cached_property,)
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,
+        use_enum_values=True,
+        ignored_types=(cached_property,),
+    )
 
     def __init_subclass__(cls, *args, **kwargs):
         super().__init_subclass__(*args, **kwargs)
@@ -245,7 +303,7 @@ class EmbeddedDocument(BaseModel, abc.ABC):
         return cls(**kwargs)
 
     def to_dict(self) -> dict:
-        return self.dict()
+        return self.model_dump()
 
     @classmethod
     def from_entity(cls, entity: datastore.Entity) -> EmbeddedDocument:
@@ -268,11 +326,17 @@ class EmbeddedDocument(BaseModel, abc.ABC):
                 exclude_from_indexes=exclude_from_indexes,
             )
 
-        dict_obj = json.loads(self.json())
+        embedded_fields = {
+            field_name
+            for field_name, field_info in type(self).model_fields.items()
+            if _is_embedded(field_info.annotation)
+        }
+        # JSON-friendly values, dumped straight from the model instead of a round trip through a JSON string
+        dict_obj = self.model_dump(mode="json", exclude=embedded_fields)
 
         data = {}
-        for field_name, field_info in self.__fields__.items():
-            if inspect.isclass(field_info.type_) and issubclass(field_info.type_, EmbeddedDocument):
+        for field_name in type(self).model_fields:
+            if field_name in embedded_fields:
                 # recursively generate entities
                 field_value = getattr(self, field_name)
                 if isinstance(field_value, list | tuple):
@@ -290,24 +354,30 @@ class EmbeddedDocument(BaseModel, abc.ABC):
 class Document(EmbeddedDocument, abc.ABC):
     id: DEFAULT_PK_FIELD_TYPE | None = None
 
-    class Config(EmbeddedDocument.Config):
-        exclude_from_indexes = ()
-        namespace = DEFAULT_NAMESPACE
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            date: lambda v: v.isoformat(),
-        }
+    # Datastore options are kept along with pydantic's own settings
+    model_config = ConfigDict(
+        exclude_from_indexes=(),
+        namespace=DEFAULT_NAMESPACE,
+    )
+
+    @field_serializer("*", mode="wrap", when_used="json")
+    def _serialize_dates(self, value, handler):
+        # Dates and datetimes are stored with `isoformat()` (eg. "+00:00" rather than pydantic's "Z")
+        if isinstance(value, date):
+            return value.isoformat()
+        return handler(value)
 
-    def __init_subclass__(cls, **kwargs):
-        super().__init_subclass__(**kwargs)
-        cls.update_forward_refs()  # needed when base model has optional field o.O
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        cls.model_rebuild()  # needed when base model has optional field o.O
 
     @property
     def pk(self):
         return getattr(self, "id", None)
 
     def save(self) -> Document:
-        return self.documents.create(**self.dict())
+        return self.documents.create(**self.model_dump())
 
     def delete(self) -> None:
         self.documents.delete(pk=self.pk)
@@ -66,7 +66,18 @@ class QuotaExceeded(Exception):
     pass
 
 
+class OperationTimeout(TimeoutError):
+    pass
+
+
 class OperationError(Exception):
     def __init__(self, errors: list):
         self.errors = errors
         super().__init__(str(self.errors))
+
+
+class BatchError(Exception):
+    def __init__(self, errors: dict, results: dict):
+        self.errors = errors
+        self.results = results
+        super().__init__(f"{len(errors)} of {len(errors) + len(results)} calls failed: {errors}")
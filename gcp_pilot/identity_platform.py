@@ -183,7 +183,6 @@ class IdentityPlatform(DiscoveryMixin, GoogleCloudPilotAPI):
         super().__init__(
             serviceName="identitytoolkit",
             version="v1",
-            cache_discovery=False,
             static_discovery=False,
             **kwargs,
         )
@@ -428,7 +427,6 @@ class IdentityPlatformAdmin(DiscoveryMixin, GoogleCloudPilotAPI):
         super().__init__(
             serviceName="identitytoolkit",
             version="v2",
-            cache_discovery=False,
             static_discovery=False,
             **kwargs,
         )
@@ -7,31 +7,38 @@ from google.oauth2.service_account import Credentials
 
 class patch_auth:
     def __init__(self, project_id: str = "potato-dev", location: str = "moon-dark1", email: str = "chuck@norris.com"):
+        self.project_id = project_id
+        self.location = location
+        self.email = email
+        self.stack = None
+
+    def __enter__(self):
+        # Patches only start here: when used as a decorator, this instance is created at import time
         # Realistic: actual class to be accepted by clients during validation
         # But fake: with as few attributes as possible, any API call using the credential should fail
         credentials = Credentials(
-            service_account_email=email,
+            service_account_email=self.email,
             signer=None,
             token_uri="",
-            project_id=project_id,
+            project_id=self.project_id,
         )
         managers = [
-            patch("google.auth.default", return_value=(credentials, project_id)),
-            patch("gcp_pilot.base.GoogleCloudPilotAPI._set_location", return_value=location),
-            patch("gcp_pilot.base.AppEngineBasedService._set_location", return_value=location),
+            patch("google.auth.default", return_value=(credentials, self.project_id)),
+            patch("gcp_pilot.base.GoogleCloudPilotAPI._set_location", return_value=self.location),
+            patch("gcp_pilot.base.AppEngineBasedService._set_location", return_value=self.location),
         ]
-        self.stack = ExitStack()
-        for mgr in managers:
-            self.stack.enter_context(mgr)
-
-    def __enter__(self):
-        return self.stack.__enter__()
+        with ExitStack() as stack:
+            for mgr in managers:
+                stack.enter_context(mgr)
+            self.stack = stack.pop_all()
+        return self.stack
 
     def start(self):
         return self.__enter__()
 
     def __exit__(self, typ, val, traceback):
-        return self.stack.__exit__(typ, val, traceback)
+        stack, self.stack = self.stack, None
+        return stack.__exit__(typ, val, traceback)
 
     def stop(self):
         self.__exit__(None, None, None)
@@ -39,7 +46,8 @@ class patch_auth:
     def __call__(self, func):
         @wraps(func)
         def wrapper(*args, **kw):
-            with self:
+            # A fresh patcher per call, so the same decorated test can run any number of times, in any order
+            with patch_auth(project_id=self.project_id, location=self.location, email=self.email):
                 return func(*args, **kw)
 
         return wrapper
@@ -10,6 +10,7 @@ from google.api_core.exceptions import AlreadyExists, NotFound
 from google.cloud import pubsub_v1
 from google.protobuf.duration_pb2 import Duration
 from google.protobuf.field_mask_pb2 import FieldMask
+from google.protobuf.internal import api_implementation
 from google.pubsub_v1 import DeadLetterPolicy, ExpirationPolicy, PushConfig, RetryPolicy, Subscription, Topic, types
 
 from gcp_pilot.base import GoogleCloudPilotAPI
@@ -17,20 +18,49 @@ from gcp_pilot.exceptions import ValidationError
 
 logger = logging.getLogger()
 
+if api_implementation.Type() == "python":
+    logger.warning(
+        "Protobuf is running its pure-Python implementation, which is much slower to build messages. "
+        "Install a binary protobuf wheel and unset PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=python.",
+    )
+
+# Bigger batches amortize publish RPCs under load, while the latency cap still flushes sparse traffic quickly
+DEFAULT_BATCH_SETTINGS = pubsub_v1.types.BatchSettings(
+    max_bytes=1_000_000,
+    max_latency=0.01,
+    max_messages=1000,
+)
+
 
 class CloudPublisher(GoogleCloudPilotAPI):
     _client_class = pubsub_v1.PublisherClient
     _service_name = "Cloud Pub/Sub"
     _google_managed_service = True
 
-    def __init__(self, enable_message_ordering: bool = False, **kwargs):
+    def __init__(
+        self,
+        enable_message_ordering: bool = False,
+        max_bytes: int | None = None,
+        max_latency: float | None = None,
+        max_messages: int | None = None,
+        **kwargs,
+    ):
         if publisher_options := kwargs.pop("publisher_options", None):
             publisher_options.enable_message_ordering = enable_message_ordering
         else:
             publisher_options = pubsub_v1.types.PublisherOptions(
                 enable_message_ordering=enable_message_ordering,
             )
-        super().__init__(publisher_options=publisher_options, **kwargs)
+
+        batch_overrides = {
+            "max_bytes": max_bytes,
+            "max_latency": max_latency,
+            "max_messages": max_messages,
+        }
+        batch_settings = (kwargs.pop("batch_settings", None) or DEFAULT_BATCH_SETTINGS)._replace(
+            **{key: value for key, value in batch_overrides.items() if value is not None},
+        )
+        super().__init__(publisher_options=publisher_options, batch_settings=batch_settings, **kwargs)
 
     def create_topic(
         self,
@@ -97,9 +127,13 @@ class CloudPublisher(GoogleCloudPilotAPI):
         topics = self.client.list_topics(
             project=project_path,
         )
+        if not prefix and not suffix:
+            yield from topics
+            return
+
+        name_prefix = f"{project_path}/topics/{prefix}"
         for topic in topics:
-            name = topic.name.split("/topics/")[-1]
-            if name.startswith(prefix) and name.endswith(suffix):
+            if topic.name.startswith(name_prefix) and topic.name.endswith(suffix):
                 yield topic
 
     def publish(
@@ -144,12 +178,17 @@ class CloudSubscriber(GoogleCloudPilotAPI):
         suffix: str = "",
         project_id: str | None = None,
     ) -> Generator[Subscription]:
+        project_path = self._project_path(project_id=project_id)
         all_subscriptions = self.client.list_subscriptions(
-            project=f"projects/{project_id or self.project_id}",
+            project=project_path,
         )
+        if not prefix and not suffix:
+            yield from all_subscriptions
+            return
+
+        name_prefix = f"{project_path}/subscriptions/{prefix}"
         for subscription in all_subscriptions:
-            name = subscription.name.split("/subscriptions/")[-1]
-            if name.startswith(prefix) and name.endswith(suffix):
+            if subscription.name.startswith(name_prefix) and subscription.name.endswith(suffix):
                 yield subscription
 
     def get_subscription(self, subscription_id: str, project_id: str | None = None) -> Subscription:
@@ -254,7 +293,7 @@ class CloudSubscriber(GoogleCloudPilotAPI):
             if not auto_create_topic:
                 raise
 
-            CloudPublisher().create_topic(
+            CloudPublisher.get_default().create_topic(
                 topic_id=topic_id,
                 project_id=project_id,
             )
@@ -1,10 +1,17 @@
 # More Information: <https://cloud.google.com/resource-manager/reference/rest>
 import logging
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Iterable
 from pathlib import Path
 
 from gcp_pilot import exceptions
-from gcp_pilot.base import AccountManagerMixin, DiscoveryMixin, GoogleCloudPilotAPI, PolicyType, ResourceType
+from gcp_pilot.base import (
+    AccountManagerMixin,
+    DiscoveryMixin,
+    GoogleCloudPilotAPI,
+    PolicyType,
+    ResourceType,
+    _map_concurrently,
+)
 
 logger = logging.getLogger("gcp-pilot")
 
@@ -26,7 +33,7 @@ class ResourceManager(AccountManagerMixin, DiscoveryMixin, GoogleCloudPilotAPI):
         )
 
     def set_policy(self, policy: PolicyType, project_id: str | None = None) -> PolicyType:
-        if not policy["bindings"]:
+        if not policy.get("bindings"):
             raise exceptions.NotAllowed("Too dangerous to set policy with empty bindings")
 
         return self._execute(
@@ -45,6 +52,45 @@ class ResourceManager(AccountManagerMixin, DiscoveryMixin, GoogleCloudPilotAPI):
         changed_policy = self._unbind_email_from_policy(email=email, role=role, policy=policy)
         return self.set_policy(policy=changed_policy, project_id=project_id)
 
+    def add_member_to_projects(
+        self,
+        email: str,
+        role: str,
+        project_ids: Iterable[str],
+        max_workers: int = 8,
+    ) -> dict[str, PolicyType]:
+        return self._map_projects(
+            func=lambda project_id: self.add_member(email=email, role=role, project_id=project_id),
+            project_ids=project_ids,
+            max_workers=max_workers,
+        )
+
+    def remove_member_from_projects(
+        self,
+        email: str,
+        role: str,
+        project_ids: Iterable[str],
+        max_workers: int = 8,
+    ) -> dict[str, PolicyType]:
+        return self._map_projects(
+            func=lambda project_id: self.remove_member(email=email, role=role, project_id=project_id),
+            project_ids=project_ids,
+            max_workers=max_workers,
+        )
+
+    def _map_projects(
+        self,
+        func: Callable[[str], PolicyType],
+        project_ids: Iterable[str],
+        max_workers: int,
+    ) -> dict[str, PolicyType]:
+        # If any project fails, a BatchError carries the errors and updated policies by project
+        return _map_concurrently(
+            func=func,
+            items={project_id: project_id for project_id in project_ids},
+            max_workers=max_workers,
+        )
+
     def get_project(self, project_id: str) -> ResourceType:
         return self._execute(
             method=self.client.projects().get,
@@ -341,12 +387,12 @@ class ServiceAgent:
     @classmethod
     def get_project_number(cls, project_id: str) -> int:
         # TODO: cache this
-        project = ResourceManager().get_project(project_id=project_id)
+        project = ResourceManager.get_default().get_project(project_id=project_id)
         return project["projectNumber"]
 
     @classmethod
     def restore(cls, services: list[str], project_id: str) -> None:
-        rm = ResourceManager()
+        rm = ResourceManager.get_default()
         for service_name in services:
             email = ServiceAgent.get_email(service_name=service_name, project_id=project_id)
             role = ServiceAgent.get_role(service_name=service_name)
@@ -1,5 +1,7 @@
 # More Information <https://cloud.google.com/run/docs/reference/rest>
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from functools import cached_property
+from typing import Any
 
 from google.api_core.client_options import ClientOptions
 from googleapiclient.discovery import Resource
@@ -26,16 +28,34 @@ class CloudRun(DiscoveryMixin, GoogleCloudPilotAPI):
         parent = self._namespace_path(project_id=project_id)
         return f"{parent}/domainmappings/{domain}"
 
-    def list_services(self, project_id: str | None = None) -> Generator[ResourceType]:
+    def list_services(self, project_id: str | None = None, fields: str | None = None) -> Generator[ResourceType]:
         params = dict(
             parent=self._namespace_path(project_id=project_id),
         )
-        yield from self._list(
-            method=self.client.namespaces().services().list,
-            result_key="items",
+        if fields:
+            params["fields"] = fields
+        yield from self._paginate_namespace(
+            method=self._services_api.list,
             params=params,
         )
 
+    def _paginate_namespace(self, method: Callable, params: dict[str, Any]) -> Generator[ResourceType]:
+        # Knative-style lists page through metadata.continue instead of nextPageToken
+        page_token = None
+        while True:
+            call_kwargs = params.copy()
+            if page_token:
+                call_kwargs["continue"] = page_token
+            results = self._execute(
+                method=method,
+                **call_kwargs,
+            )
+            yield from results.get("items", [])
+
+            page_token = results.get("metadata", {}).get("continue")
+            if not page_token:
+                break
+
     def get_service(
         self,
         service_name: str,
@@ -122,26 +142,30 @@ class CloudRun(DiscoveryMixin, GoogleCloudPilotAPI):
         self,
         service_name: str | None = None,
         project_id: str | None = None,
+        fields: str | None = None,
     ) -> Generator[ResourceType]:
+        # Partial responses must keep the page token: eg. fields="items(metadata/name,metadata/labels),metadata/continue"
         params = dict(
             parent=self._namespace_path(project_id=project_id),
         )
-        items = self._list(
-            method=self.client.namespaces().revisions().list,
-            result_key="items",
+        if fields:
+            params["fields"] = fields
+        if service_name:
+            params["labelSelector"] = f"serving.knative.dev/service={service_name}"
+
+        yield from self._paginate_namespace(
+            method=self._revisions_api.list,
             params=params,
         )
-        for item in items:
-            if not service_name or item["metadata"]["labels"]["serving.knative.dev/service"] == service_name:
-                yield item
 
-    def list_domain_mappings(self, project_id: str | None = None) -> Generator[ResourceType]:
+    def list_domain_mappings(self, project_id: str | None = None, fields: str | None = None) -> Generator[ResourceType]:
         params = dict(
             parent=self._namespace_path(project_id=project_id),
         )
-        yield from self._list(
-            method=self.client.namespaces().domainmappings().list,
-            result_key="items",
+        if fields:
+            params["fields"] = fields
+        yield from self._paginate_namespace(
+            method=self._domain_mappings_api.list,
             params=params,
         )
 
@@ -208,7 +232,26 @@ class CloudRun(DiscoveryMixin, GoogleCloudPilotAPI):
         # Reminder: List methods do not require a localized client
         if not location:
             location = self.location if not project_id else self._get_project_default_location(project_id=project_id)
-        return self._build_client(location=location)
+        if location not in self._localized_clients:
+            self._localized_clients[location] = self._build_client(location=location)
+        return self._localized_clients[location]
+
+    @cached_property
+    def _localized_clients(self) -> dict[str, Resource]:
+        return {}
+
+    # Traversing the discovery resource builds new collection objects every time, so the list endpoints are kept
+    @cached_property
+    def _services_api(self) -> Resource:
+        return self.client.namespaces().services()
+
+    @cached_property
+    def _revisions_api(self) -> Resource:
+        return self.client.namespaces().revisions()
+
+    @cached_property
+    def _domain_mappings_api(self) -> Resource:
+        return self.client.namespaces().domainmappings()
 
     def _build_client(self, location: str | None = None, **kwargs) -> Resource:
         options = ClientOptions(api_endpoint=self._service_endpoint(location=location))
@@ -1,11 +1,12 @@
 # More Information <https://cloud.google.com/scheduler/docs/reference/rest>
 import os
-from collections.abc import Generator
+from collections.abc import Generator, Iterable, Sequence
+from typing import Any
 
 from google.api_core.exceptions import NotFound
 from google.cloud import scheduler
 
-from gcp_pilot.base import AppEngineBasedService, GoogleCloudPilotAPI
+from gcp_pilot.base import AppEngineBasedService, GoogleCloudPilotAPI, _map_concurrently
 
 DEFAULT_TIMEZONE = os.environ.get("TIMEZONE", "Etc/UTC")  # UTC
 MAX_TIMEOUT = 30 * 60  # max allowed to HTTP endpoints is 30 minutes
@@ -13,6 +14,7 @@ MAX_TIMEOUT = 30 * 60  # max allowed to HTTP endpoints is 30 minutes
 
 class CloudScheduler(AppEngineBasedService, GoogleCloudPilotAPI):
     _client_class = scheduler.CloudSchedulerClient
+    _share_transport = True
     DEFAULT_METHOD = scheduler.HttpMethod.POST
 
     def __init__(self, **kwargs):
@@ -26,13 +28,14 @@ class CloudScheduler(AppEngineBasedService, GoogleCloudPilotAPI):
         parent_name = self._parent_path(project_id=project_id)
         return f"{parent_name}/jobs/{job}"
 
-    def create(
+    def _build_job(
         self,
+        *,
         name: str,
         url: str,
-        payload: str,
+        payload: str | bytes,
         cron: str,
-        timezone: str = DEFAULT_TIMEZONE,
+        timezone: str | None = DEFAULT_TIMEZONE,
         method: int = DEFAULT_METHOD,
         headers: dict[str, str] | None = None,
         project_id: str | None = None,
@@ -40,17 +43,15 @@ class CloudScheduler(AppEngineBasedService, GoogleCloudPilotAPI):
         timeout_in_seconds: int = MAX_TIMEOUT,
         retry_count: int = 0,
     ) -> scheduler.Job:
-        parent = self._parent_path(project_id=project_id)
-        job_name = self._job_path(job=name, project_id=project_id)
-        job = scheduler.Job(
-            name=job_name,
+        return scheduler.Job(
+            name=self._job_path(job=name, project_id=project_id),
             schedule=cron,
             time_zone=timezone or self.timezone,
             attempt_deadline=self._as_duration(seconds=timeout_in_seconds),
             http_target=scheduler.HttpTarget(
                 uri=url,
                 http_method=method,
-                body=payload.encode(),
+                body=self._as_bytes(payload),
                 headers=headers or {},
                 **(self.get_oidc_token(audience=url) if use_oidc_auth else {}),
             ),
@@ -59,16 +60,22 @@ class CloudScheduler(AppEngineBasedService, GoogleCloudPilotAPI):
             ),
         )
 
-        response = self.client.create_job(request={"parent": parent, "job": job})
-        return response
+    def _create_job(self, job: scheduler.Job, project_id: str | None = None) -> scheduler.Job:
+        parent = self._parent_path(project_id=project_id)
+        return self.client.create_job(request={"parent": parent, "job": job})
 
-    def update(
+    def _update_job(self, job: scheduler.Job) -> scheduler.Job:
+        return self.client.update_job(
+            job=job,
+        )
+
+    def create(
         self,
         name: str,
         url: str,
-        payload: str,
+        payload: str | bytes,
         cron: str,
-        timezone: str | None = DEFAULT_TIMEZONE,
+        timezone: str = DEFAULT_TIMEZONE,
         method: int = DEFAULT_METHOD,
         headers: dict[str, str] | None = None,
         project_id: str | None = None,
@@ -76,32 +83,61 @@ class CloudScheduler(AppEngineBasedService, GoogleCloudPilotAPI):
         timeout_in_seconds: int = MAX_TIMEOUT,
         retry_count: int = 0,
     ) -> scheduler.Job:
-        job_name = self._job_path(job=name, project_id=project_id)
-        job = scheduler.Job(
-            name=job_name,
-            schedule=cron,
-            time_zone=timezone or self.timezone,
-            attempt_deadline=self._as_duration(seconds=timeout_in_seconds),
-            http_target=scheduler.HttpTarget(
-                uri=url,
-                http_method=method,
-                body=payload.encode(),
-                headers=headers or {},
-                **(self.get_oidc_token(audience=url) if use_oidc_auth else {}),
-            ),
-            retry_config=scheduler.RetryConfig(
-                retry_count=retry_count,
-            ),
+        job = self._build_job(
+            name=name,
+            url=url,
+            payload=payload,
+            cron=cron,
+            timezone=timezone,
+            method=method,
+            headers=headers,
+            project_id=project_id,
+            use_oidc_auth=use_oidc_auth,
+            timeout_in_seconds=timeout_in_seconds,
+            retry_count=retry_count,
         )
+        return self._create_job(job=job, project_id=project_id)
 
-        response = self.client.update_job(
-            job=job,
+    def update(
+        self,
+        name: str,
+        url: str,
+        payload: str | bytes,
+        cron: str,
+        timezone: str | None = DEFAULT_TIMEZONE,
+        method: int = DEFAULT_METHOD,
+        headers: dict[str, str] | None = None,
+        project_id: str | None = None,
+        use_oidc_auth: bool = True,
+        timeout_in_seconds: int = MAX_TIMEOUT,
+        retry_count: int = 0,
+    ) -> scheduler.Job:
+        job = self._build_job(
+            name=name,
+            url=url,
+            payload=payload,
+            cron=cron,
+            timezone=timezone,
+            method=method,
+            headers=headers,
+            project_id=project_id,
+            use_oidc_auth=use_oidc_auth,
+            timeout_in_seconds=timeout_in_seconds,
+            retry_count=retry_count,
         )
-        return response
+        return self._update_job(job=job)
 
-    def list(self, prefix: str = "", project_id: str | None = None) -> Generator[scheduler.Job]:
+    def list(
+        self,
+        prefix: str = "",
+        project_id: str | None = None,
+        fields: str | None = None,
+    ) -> Generator[scheduler.Job]:
+        # Partial responses must keep the page token: eg. fields="jobs.name,next_page_token"
+        # Jobs then only carry the requested fields, so use `get` for the full body of the matches
         parent = self._parent_path(project_id=project_id)
-        for job in self.client.list_jobs(parent=parent):
+        metadata = [("x-goog-fieldmask", fields)] if fields else ()
+        for job in self.client.list_jobs(request={"parent": parent}, metadata=metadata):
             if job.name.split("/jobs/")[-1].startswith(prefix):
                 yield job
 
@@ -121,7 +157,7 @@ class CloudScheduler(AppEngineBasedService, GoogleCloudPilotAPI):
         self,
         name: str,
         url: str,
-        payload: str,
+        payload: str | bytes,
         cron: str,
         timezone: str = DEFAULT_TIMEZONE,
         method: int = DEFAULT_METHOD,
@@ -131,35 +167,34 @@ class CloudScheduler(AppEngineBasedService, GoogleCloudPilotAPI):
         timeout_in_seconds: int = MAX_TIMEOUT,
         retry_count: int = 0,
     ) -> scheduler.Job:
+        # The same job is reused by the create fallback, so it is built (and its payload encoded) only once
+        job = self._build_job(
+            name=name,
+            url=url,
+            payload=payload,
+            cron=cron,
+            timezone=timezone,
+            method=method,
+            headers=headers,
+            project_id=project_id,
+            use_oidc_auth=use_oidc_auth,
+            timeout_in_seconds=timeout_in_seconds,
+            retry_count=retry_count,
+        )
         try:
-            response = self.update(
-                name=name,
-                url=url,
-                payload=payload,
-                cron=cron,
-                timezone=timezone,
-                method=method,
-                headers=headers,
-                project_id=project_id,
-                use_oidc_auth=use_oidc_auth,
-                timeout_in_seconds=timeout_in_seconds,
-                retry_count=retry_count,
-            )
+            return self._update_job(job=job)
         except NotFound:
-            response = self.create(
-                name=name,
-                url=url,
-                payload=payload,
-                cron=cron,
-                timezone=timezone,
-                method=method,
-                headers=headers,
-                project_id=project_id,
-                use_oidc_auth=use_oidc_auth,
-                timeout_in_seconds=timeout_in_seconds,
-                retry_count=retry_count,
-            )
-        return response
+            return self._create_job(job=job, project_id=project_id)
+
+    def put_many(self, jobs: Iterable[dict[str, Any]], max_workers: int = 8) -> Sequence[scheduler.Job]:
+        # Each job is a dict of `put` arguments; the gRPC client is thread-safe, so upserts run concurrently.
+        # If any upsert fails, a BatchError carries the errors and created jobs by their index in `jobs`
+        results = _map_concurrently(
+            func=lambda job: self.put(**job),
+            items=dict(enumerate(jobs)),
+            max_workers=max_workers,
+        )
+        return list(results.values())
 
 
 __all__ = ("CloudScheduler",)
@@ -1,4 +1,8 @@
 # More Information: <https://googleapis.dev/python/secretmanager/latest/index.html>
+from collections import deque
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+
 from google.api_core.exceptions import NotFound
 from google.cloud import secretmanager
 
@@ -7,6 +11,7 @@ from gcp_pilot.base import GoogleCloudPilotAPI
 
 class SecretManager(GoogleCloudPilotAPI):
     _client_class = secretmanager.SecretManagerServiceClient
+    _share_transport = True
 
     def _secret_path(self, key: str, project_id: str | None = None) -> str:
         parent = self._project_path(project_id=project_id)
@@ -33,12 +38,12 @@ class SecretManager(GoogleCloudPilotAPI):
 
         return self.client.add_secret_version(request={"parent": parent, "payload": {"data": value.encode()}})
 
-    def list_secrets(
+    def list_secret_names(
         self,
         prefix: str | None = None,
         suffix: str | None = None,
         project_id: str | None = None,
-    ) -> list[tuple[str, str]]:
+    ) -> Generator[str]:
         parent = self._project_path(project_id=project_id)
         secrets = self.client.list_secrets(
             request={
@@ -47,11 +52,36 @@ class SecretManager(GoogleCloudPilotAPI):
         )
         for secret in secrets:
             name = secret.name.rsplit("secrets/", 1)[-1]
-            if prefix and not name.startswith(prefix=prefix):
+            if prefix and not name.startswith(prefix):
                 continue
-            if suffix and not name.endswith(suffix=suffix):
+            if suffix and not name.endswith(suffix):
                 continue
-            yield name, self.get_secret(key=name, project_id=project_id)
+            yield name
+
+    def list_secrets(
+        self,
+        prefix: str | None = None,
+        suffix: str | None = None,
+        project_id: str | None = None,
+        max_workers: int = 16,
+    ) -> Generator[tuple[str, str]]:
+        names = self.list_secret_names(prefix=prefix, suffix=suffix, project_id=project_id)
+
+        # Each value is a separate RPC, so they are fetched concurrently over the (thread-safe) gRPC client.
+        # Only `max_workers` fetches are in flight at a time, so stopping early doesn't fetch every secret
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = deque()
+        try:
+            for key in names:
+                pending.append((key, executor.submit(self.get_secret, key=key, project_id=project_id)))
+                if len(pending) >= max_workers:
+                    name, future = pending.popleft()
+                    yield name, future.result()
+            while pending:
+                name, future = pending.popleft()
+                yield name, future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
 
     def add_secret(self, key: str, value: str, project_id: str | None = None) -> str:
         try:
@@ -1,9 +1,11 @@
 # More Information: https://cloud.google.com/service-usage/docs/reference/rest
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
 from enum import Enum
 
 from gcp_pilot.base import DiscoveryMixin, GoogleCloudPilotAPI, ResourceType
 
+MAX_SERVICES_PER_BATCH = 20  # batchEnable cannot enable more than 20 services per call
+
 
 class ServiceStatus(Enum):
     ENABLED = "ENABLED"
@@ -27,12 +29,16 @@ class ServiceUsage(DiscoveryMixin, GoogleCloudPilotAPI):
         self,
         project_id: str | None = None,
         status: ServiceStatus = ServiceStatus.ENABLED,
+        fields: str | None = None,
     ) -> Generator[ResourceType]:
+        # Partial responses must keep the page token: eg. fields="services(name,state),nextPageToken"
         params = dict(
             parent=self._project_path(project_id=project_id),
         )
         if status:
             params["filter"] = f"state:{status.value}"
+        if fields:
+            params["fields"] = fields
 
         yield from self._paginate(
             method=self.client.services().list,
@@ -62,6 +68,23 @@ class ServiceUsage(DiscoveryMixin, GoogleCloudPilotAPI):
             name=name,
         )
 
+    def enable_services(
+        self,
+        service_names: Iterable[str],
+        project_id: str | None = None,
+    ) -> list[ResourceType]:
+        # One batchEnable operation per group of services, instead of one operation per service
+        parent = self._project_path(project_id=project_id)
+        service_ids = list(service_names)
+        return [
+            self._execute(
+                method=self.client.services().batchEnable,
+                parent=parent,
+                body={"serviceIds": service_ids[i : i + MAX_SERVICES_PER_BATCH]},
+            )
+            for i in range(0, len(service_ids), MAX_SERVICES_PER_BATCH)
+        ]
+
     def disable_service(
         self,
         service_name: str,
@@ -1,9 +1,17 @@
+from functools import cached_property
+from typing import Any
+
 import gspread
 from google.auth.transport.requests import AuthorizedSession
 from gspread.client import extract_id_from_url
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from gcp_pilot.base import GoogleCloudPilotAPI
 
+POOL_SIZE = 32
+MAX_RETRIES = 3
+
 
 class Spreadsheet(GoogleCloudPilotAPI):
     _scopes = [
@@ -16,16 +24,49 @@ class Spreadsheet(GoogleCloudPilotAPI):
         if sheet_id.startswith("https://"):
             sheet_id = extract_id_from_url(sheet_id)
         self.sheet_id = sheet_id
-        self.spreadsheet = self.client.open_by_key(self.sheet_id)
+        self._worksheets: dict[str, gspread.Worksheet] = {}
+
+    @cached_property
+    def spreadsheet(self) -> gspread.Spreadsheet:
+        return self.client.open_by_key(self.sheet_id)
 
     def worksheet(self, name: str) -> gspread.Worksheet:
-        return self.spreadsheet.worksheet(name)
+        if name not in self._worksheets:
+            self._worksheets[name] = self.spreadsheet.worksheet(name)
+        return self._worksheets[name]
+
+    def refresh(self) -> None:
+        # Drop the cached workbook and worksheets, eg. after tabs are renamed or removed
+        self._worksheets.clear()
+        self.__dict__.pop("spreadsheet", None)
+
+    def batch_get(self, ranges: list[str]) -> list[list[list[str]]]:
+        # A single values.batchGet call for A1 ranges across tabs, eg. ["Sheet1!A:C", "Sheet2!A:C"]
+        response = self.client.http_client.values_batch_get(self.sheet_id, ranges)
+        return [value_range.get("values", []) for value_range in response.get("valueRanges", [])]
+
+    def batch_update(self, data: list[dict[str, Any]], value_input_option: str = "USER_ENTERED") -> dict[str, Any]:
+        # A single values.batchUpdate call, eg. data=[{"range": "Sheet1!A1", "values": [["chuck"]]}]
+        return self.client.http_client.values_batch_update(
+            self.sheet_id,
+            body={"valueInputOption": value_input_option, "data": data},
+        )
 
     @classmethod
     def _client_class(cls, credentials, **kwargs):
-        client = gspread.Client(auth=credentials)
-        client.session = AuthorizedSession(credentials)
-        return client
+        session = AuthorizedSession(credentials)
+        # Bigger pool, so concurrent reads/writes reuse open TLS connections instead of handshaking again.
+        # Only idempotent requests are retried, so a failed append (POST) is never written twice
+        retries = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retries)
+        session.mount("https://", adapter)
+        return gspread.Client(auth=credentials, session=session)
 
     @property
     def url(self) -> str:
@@ -1,6 +1,10 @@
 # More Information: <https://cloud.google.com/source-repositories/docs/reference/rest>
+from collections.abc import Generator
+from functools import cached_property
 from typing import Any
 
+from googleapiclient.discovery import Resource
+
 from gcp_pilot import exceptions
 from gcp_pilot.base import DiscoveryMixin, GoogleCloudPilotAPI
 
@@ -18,24 +22,30 @@ class SourceRepository(DiscoveryMixin, GoogleCloudPilotAPI):
             **kwargs,
         )
 
+    @cached_property
+    def _repos_api(self) -> Resource:
+        return self.client.projects().repos()
+
     def _repo_path(self, repo: str, project_id: str | None = None) -> str:
         parent_path = self._project_path(project_id=project_id)
         return f"{parent_path}/repos/{repo}"
 
-    def list_repos(self, project_id: str | None = None) -> RepoType:
+    def list_repos(self, project_id: str | None = None, fields: str | None = None) -> Generator[RepoType]:
+        # Partial responses must keep the page token: eg. fields="repos(name,url),nextPageToken"
         params = dict(
             name=self._project_path(project_id=project_id),
         )
-        items = self._paginate(
-            method=self.client.projects().repos().list,
+        if fields:
+            params["fields"] = fields
+        return self._paginate(
+            method=self._repos_api.list,
             result_key="repos",
             params=params,
         )
-        yield from items
 
     def get_repo(self, repo_name: str, project_id: str | None = None) -> RepoType:
         return self._execute(
-            method=self.client.projects().repos().get,
+            method=self._repos_api.get,
             name=self._repo_path(repo=repo_name, project_id=project_id),
         )
 
@@ -44,7 +54,7 @@ class SourceRepository(DiscoveryMixin, GoogleCloudPilotAPI):
         repo_path = self._repo_path(repo=repo_name, project_id=project_id)
         try:
             return self._execute(
-                method=self.client.projects().repos().create,
+                method=self._repos_api.create,
                 parent=parent,
                 body={
                     "name": repo_path,
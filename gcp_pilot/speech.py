@@ -1,12 +1,29 @@
-from google.cloud.speech_v1 import RecognitionAudio, RecognitionConfig, SpeechClient
+import io
+from collections.abc import Generator
+from typing import BinaryIO
+
+from google.cloud.speech_v1 import (
+    RecognitionAudio,
+    RecognitionConfig,
+    SpeechClient,
+    StreamingRecognitionConfig,
+    StreamingRecognizeRequest,
+)
 
 from gcp_pilot.base import GoogleCloudPilotAPI
 
+MAX_CONTENT_SIZE = 10 * 1024 * 1024  # max inline audio accepted by recognize
+STREAM_CHUNK_SIZE = 25 * 1000  # max audio allowed in each streaming request
+
 
 class Speech(GoogleCloudPilotAPI):
     _client_class = SpeechClient
 
     def speech_file_to_text(self, flac_content, language="en", rate=44100, long_running=False):
+        # Long-running recognition is kept when asked for, since streaming is limited to about 5 minutes of audio
+        if len(flac_content) > MAX_CONTENT_SIZE and not long_running:
+            return self.speech_stream_to_text(file=io.BytesIO(flac_content), language=language, rate=rate)
+
         audio = RecognitionAudio(content=flac_content)
         return self._speech_to_text(
             audio=audio,
@@ -24,13 +41,31 @@ class Speech(GoogleCloudPilotAPI):
             long_running=long_running,
         )
 
-    def _speech_to_text(self, audio, language, rate, long_running=False):
-        config = RecognitionConfig(
+    def speech_stream_to_text(self, file: BinaryIO, language="en", rate=44100, chunk_size=STREAM_CHUNK_SIZE):
+        # The audio is read and sent in chunks, so it is never fully loaded in memory
+        def _requests() -> Generator[StreamingRecognizeRequest]:
+            while chunk := file.read(chunk_size):
+                yield StreamingRecognizeRequest(audio_content=chunk)
+
+        config = StreamingRecognitionConfig(config=self._build_config(language=language, rate=rate))
+        responses = self.client.streaming_recognize(config=config, requests=_requests())
+        return [
+            result.alternatives[0].transcript
+            for response in responses
+            for result in response.results
+            if result.is_final
+        ]
+
+    def _build_config(self, language, rate):
+        return RecognitionConfig(
             encoding=RecognitionConfig.AudioEncoding.FLAC,
             sample_rate_hertz=rate,
             language_code=language,
         )
 
+    def _speech_to_text(self, audio, language, rate, long_running=False):
+        config = self._build_config(language=language, rate=rate)
+
         if not long_running:
             operation = self.client.recognize(config=config, audio=audio)
             results = operation.results
@@ -1,26 +1,36 @@
 # More Information: https://cloud.google.com/sql/docs/mysql/apis#rest-api
-import json
 import logging
+import random
+import threading
 import time
 import uuid
-from collections.abc import Generator
+from collections.abc import Generator, Iterable
+from concurrent.futures import Future
+from functools import cached_property
 from typing import Any
 
+from googleapiclient.discovery import Resource
 from googleapiclient.errors import HttpError
 
 from gcp_pilot import exceptions
-from gcp_pilot.base import DiscoveryMixin, GoogleCloudPilotAPI
+from gcp_pilot.base import DiscoveryBatch, DiscoveryMixin, GoogleCloudPilotAPI
 
 InstanceType = DatabaseType = UserType = dict[str, Any]
 
 
 logger = logging.getLogger("gcp-pilot")
 
+_INSTANCE_WAITERS: dict[tuple[str, str], Future] = {}
+_INSTANCE_WAITERS_LOCK = threading.Lock()
+
 
 class CloudSQL(DiscoveryMixin, GoogleCloudPilotAPI):
     _iam_roles = ["cloudsql.client"]
 
     def __init__(self, **kwargs):
+        self.poll_base = kwargs.pop("poll_base", 1.0)
+        self.poll_cap = kwargs.pop("poll_cap", 30.0)
+        self.poll_timeout = kwargs.pop("poll_timeout", 900.0)
         super().__init__(
             serviceName="sqladmin",
             version="v1",
@@ -28,18 +38,38 @@ class CloudSQL(DiscoveryMixin, GoogleCloudPilotAPI):
             **kwargs,
         )
 
+    # Resource collections are built once per client instead of on every call
+    @cached_property
+    def _instances_api(self) -> Resource:
+        return self.client.instances()
+
+    @cached_property
+    def _databases_api(self) -> Resource:
+        return self.client.databases()
+
+    @cached_property
+    def _users_api(self) -> Resource:
+        return self.client.users()
+
+    @cached_property
+    def _ssl_certs_api(self) -> Resource:
+        return self.client.sslCerts()
+
+    @cached_property
+    def _operations_api(self) -> Resource:
+        return self.client.operations()
+
     def list_instances(self, project_id: str | None = None) -> Generator[InstanceType]:
         params = dict(project=project_id or self.project_id)
-        instances = self._paginate(
-            method=self.client.instances().list,
+        return self._paginate(
+            method=self._instances_api.list,
             result_key="items",
             params=params,
         )
-        yield from instances
 
     def get_instance(self, name: str, project_id: str | None = None) -> InstanceType:
         return self._execute(
-            method=self.client.instances().get,
+            method=self._instances_api.get,
             instance=name,
             project=project_id or self.project_id,
         )
@@ -65,37 +95,93 @@ class CloudSQL(DiscoveryMixin, GoogleCloudPilotAPI):
             ),
         )
         try:
-            sql_instance = self._execute(
-                method=self.client.instances().insert,
+            operation = self._execute(
+                method=self._instances_api.insert,
                 project=project_id or self.project_id,
                 body=body,
             )
-            current_state = sql_instance["status"]
         except exceptions.AlreadyExists:
             if not exists_ok:
                 raise
 
             try:
                 sql_instance = self.get_instance(name=name, project_id=project_id)
-                current_state = sql_instance["state"]
             except exceptions.NotFound as exc:
                 raise exceptions.DeletedRecently(resource=f"Instance {name}") from exc
 
+            if not wait_ready or sql_instance["state"] == "RUNNABLE":
+                return sql_instance
+            return self._wait_runnable(name=name, project_id=project_id, current_state=sql_instance["state"])
+
         if not wait_ready:
+            return operation
+        # The operation is much lighter to poll than the whole instance, which is only fetched once it is done
+        self._wait_operation(name=name, operation=operation, project_id=project_id)
+        logger.info(f"Instance {name} is RUNNABLE!")
+        return self.get_instance(name=name, project_id=project_id)
+
+    def _wait_operation(self, name: str, operation: dict[str, Any], project_id: str | None = None) -> dict[str, Any]:
+        backoff = self._backoff(name=name)
+        while operation["status"] != "DONE":
+            logger.info(f"Instance {name} operation is still {operation['status']}. Waiting until DONE.")
+            next(backoff)
+            operation = self._execute(
+                method=self._operations_api.get,
+                operation=operation["name"],
+                project=project_id or self.project_id,
+            )
+
+        if "error" in operation:
+            raise exceptions.OperationError(errors=operation["error"].get("errors", []))
+        return operation
+
+    def _wait_runnable(self, name: str, project_id: str | None, current_state: str) -> InstanceType:
+        # Concurrent waits for the same instance share a single poller and its outcome
+        key = (project_id or self.project_id, name)
+        with _INSTANCE_WAITERS_LOCK:
+            waiter = _INSTANCE_WAITERS.get(key)
+            is_poller = waiter is None
+            if is_poller:
+                waiter = _INSTANCE_WAITERS[key] = Future()
+        if not is_poller:
+            return waiter.result()
+
+        try:
+            sql_instance = self._poll_runnable(name=name, project_id=project_id, current_state=current_state)
+        except BaseException as exc:
+            waiter.set_exception(exc)
+            raise
+        else:
+            waiter.set_result(sql_instance)
             return sql_instance
+        finally:
+            with _INSTANCE_WAITERS_LOCK:
+                del _INSTANCE_WAITERS[key]
 
+    def _poll_runnable(self, name: str, project_id: str | None, current_state: str) -> InstanceType:
+        backoff = self._backoff(name=name)
         while current_state != "RUNNABLE":
             logger.info(f"Instance {name} is still {current_state}. Waiting until RUNNABLE.")
-            time.sleep(1)  # TODO: improve this: exp backoff
+            next(backoff)
             sql_instance = self.get_instance(name=name, project_id=project_id)
             current_state = sql_instance["state"]
         logger.info(f"Instance {name} is {current_state}!")
         return sql_instance
 
+    def _backoff(self, name: str) -> Generator[None]:
+        # Provisioning takes minutes, so back off exponentially (with jitter) instead of polling every second
+        deadline = time.monotonic() + self.poll_timeout
+        delay = self.poll_base
+        while (remaining := deadline - time.monotonic()) > 0:
+            time.sleep(min(delay, remaining))
+            yield
+            delay = min(self.poll_cap, delay * 2) + random.uniform(0, self.poll_base / 2)
+        raise exceptions.OperationTimeout(f"Instance {name} is not ready after {self.poll_timeout}s")
+
     def get_database(self, instance: str, database: str, project_id: str | None = None) -> DatabaseType:
         project_id = project_id or self.project_id
         return self._execute(
-            method=self.client.databases().get,
+            method=self._databases_api.get,
             instance=instance,
             database=database,
             project=project_id,
@@ -107,27 +193,35 @@ class CloudSQL(DiscoveryMixin, GoogleCloudPilotAPI):
         instance: str,
         project_id: str | None = None,
         exists_ok: bool = True,
-    ) -> DatabaseType:
+        batch: DiscoveryBatch | None = None,
+    ) -> DatabaseType | str:
         body = dict(
             name=name,
         )
-        try:
-            return (
-                self.client.databases()
-                .insert(
-                    instance=instance,
-                    project=project_id or self.project_id,
-                    body=body,
-                )
-                .execute()
+        if batch is not None:
+            # Batched calls skip the not-ready/already-exists fallback, as their errors only come out of the batch
+            return self._execute(
+                method=self._databases_api.insert,
+                instance=instance,
+                project=project_id or self.project_id,
+                body=body,
+                batch=batch,
             )
+        try:
+            return self._databases_api.insert(
+                instance=instance,
+                project=project_id or self.project_id,
+                body=body,
+            ).execute(http=self._thread_http)
         except HttpError as exc:
-            # IDK. Weird bug that the error_details is empty if too fast
-            error_details = json.loads(exc.content.decode())["error"]["message"]
+            # HttpError already parsed the response: prefer the structured reasons and fall back to its message,
+            # since the details can be empty if too fast
+            reasons = {detail.get("reason") for detail in exc.error_details or [] if isinstance(detail, dict)}
+            bad_request = exc.status_code == 400
 
-            not_ready = exc.resp.status == 400 and "is not running" in error_details
-            already_exists = exc.resp.status == 400 and "already exists" in error_details and exists_ok
-            if not_ready or already_exists:
+            not_ready = "instanceNotReady" in reasons or (bad_request and "is not running" in exc.reason)
+            already_exists = "duplicate" in reasons or (bad_request and "already exists" in exc.reason)
+            if not_ready or (already_exists and exists_ok):
                 return self.get_database(instance=instance, database=name, project_id=project_id)
             raise
 
@@ -136,22 +230,29 @@ class CloudSQL(DiscoveryMixin, GoogleCloudPilotAPI):
             instance=instance,
             project=project_id or self.project_id,
         )
-        users = self._paginate(
-            method=self.client.users().list,
+        return self._paginate(
+            method=self._users_api.list,
             params=params,
         )
-        yield from users
 
-    def create_user(self, name: str, password: str, instance: str, project_id: str | None = None) -> UserType:
+    def create_user(
+        self,
+        name: str,
+        password: str,
+        instance: str,
+        project_id: str | None = None,
+        batch: DiscoveryBatch | None = None,
+    ) -> UserType | str:
         body = dict(
             name=name,
             password=password,
         )
         return self._execute(
-            method=self.client.users().insert,
+            method=self._users_api.insert,
             instance=instance,
             project=project_id or self.project_id,
             body=body,
+            batch=batch,
         )
 
     def create_ssl_cert(
@@ -159,15 +260,17 @@ class CloudSQL(DiscoveryMixin, GoogleCloudPilotAPI):
         instance: str,
         project_id: str | None = None,
         ssl_name: str | None = None,
-    ) -> UserType:
+        batch: DiscoveryBatch | None = None,
+    ) -> UserType | str:
         body = dict(
             commonName=ssl_name or uuid.uuid4().hex,
         )
         return self._execute(
-            method=self.client.sslCerts().insert,
+            method=self._ssl_certs_api.insert,
             instance=instance,
             project=project_id or self.project_id,
             body=body,
+            batch=batch,
         )
 
     def list_ssl_certs(self, instance: str, project_id: str | None = None) -> Generator[dict]:
@@ -175,27 +278,49 @@ class CloudSQL(DiscoveryMixin, GoogleCloudPilotAPI):
             instance=instance,
             project=project_id or self.project_id,
         )
-        certs = self._paginate(
-            method=self.client.sslCerts().list,
+        return self._paginate(
+            method=self._ssl_certs_api.list,
             params=params,
         )
-        yield from certs
 
     def delete_ssl_cert(
         self, instance: str, ssl_name: str, project_id: str | None = None, not_found_ok: bool = True
     ) -> dict:
+        deleted = self.delete_ssl_certs(
+            instance=instance,
+            ssl_names=[ssl_name],
+            project_id=project_id,
+            not_found_ok=not_found_ok,
+        )
+        return deleted.get(ssl_name)
+
+    def delete_ssl_certs(
+        self,
+        instance: str,
+        ssl_names: Iterable[str],
+        project_id: str | None = None,
+        not_found_ok: bool = True,
+    ) -> dict[str, dict]:
+        # The certificates are listed once and all deletions are sent in a single batch request
+        fingerprints = {}
         for cert in self.list_ssl_certs(instance=instance, project_id=project_id):
-            if cert["commonName"] != ssl_name:
-                continue
-            sha1_fingerprint = cert["sha1Fingerprint"]
-            return self._execute(
-                method=self.client.sslCerts().delete,
+            # When a name is repeated, only the first certificate listed with it is deleted
+            fingerprints.setdefault(cert["commonName"], cert["sha1Fingerprint"])
+        ssl_names = list(ssl_names)
+        missing = [ssl_name for ssl_name in ssl_names if ssl_name not in fingerprints]
+        if missing and not not_found_ok:
+            raise exceptions.NotFound(f"SSL certificates not found: {', '.join(missing)}")
+
+        calls = {
+            ssl_name: self._ssl_certs_api.delete(
                 instance=instance,
-                sha1Fingerprint=sha1_fingerprint,
+                sha1Fingerprint=fingerprints[ssl_name],
                 project=project_id or self.project_id,
             )
-        if not not_found_ok:
-            raise exceptions.NotFound()
+            for ssl_name in ssl_names
+            if ssl_name in fingerprints
+        }
+        return self._execute_batch(calls=calls) if calls else {}
 
 
 __all__ = ("CloudSQL",)
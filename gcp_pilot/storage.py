@@ -1,21 +1,55 @@
 # More Information: https://googleapis.dev/python/storage/latest/index.html
 import io
-from collections.abc import Generator
+import os
+import tempfile
+import time
+from collections.abc import Generator, Iterable
+from contextlib import contextmanager
 from datetime import timedelta
 from pathlib import Path
+from typing import IO, Any
 
 import requests
 from google.cloud import storage
 from google.cloud.exceptions import Conflict, NotFound
-from google.cloud.storage import Blob, Bucket
+from google.cloud.storage import Blob, Bucket, transfer_manager
+from google.oauth2.service_account import Credentials as ServiceAccountCredentials
+from requests.adapters import HTTPAdapter
 
 from gcp_pilot import exceptions
 from gcp_pilot.base import GoogleCloudPilotAPI
 
+# Files above the threshold are uploaded as concurrent chunks; smaller ones are faster in a single stream
+PARALLEL_UPLOAD_THRESHOLD = int(os.environ.get("GCP_STORAGE_PARALLEL_UPLOAD_THRESHOLD", str(150 * 1024 * 1024)))
+PARALLEL_UPLOAD_CHUNK_SIZE = int(os.environ.get("GCP_STORAGE_PARALLEL_UPLOAD_CHUNK_SIZE", str(32 * 1024 * 1024)))
+PARALLEL_UPLOAD_MAX_WORKERS = int(os.environ.get("GCP_STORAGE_PARALLEL_UPLOAD_MAX_WORKERS", "8"))
+# Downloading many blobs is bound by round-trips, not CPU, so it uses more workers than there are cores
+DOWNLOAD_MANY_MAX_WORKERS = int(
+    os.environ.get("GCP_STORAGE_DOWNLOAD_MANY_MAX_WORKERS", str(min(32, (os.cpu_count() or 4) * 4)))
+)
+HTTP_POOL_SIZE = max(PARALLEL_UPLOAD_MAX_WORKERS, DOWNLOAD_MANY_MAX_WORKERS)
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+LIST_PAGE_SIZE = 1000  # the largest page served when listing objects
+BATCH_SIZE = 100  # the most calls recommended in a single batch request
+BUCKET_CACHE_TTL = 300
+DOWNLOAD_SPOOL_SIZE = 8 * 1024 * 1024  # same as the largest payload uploaded in a single request
+
 
 class CloudStorage(GoogleCloudPilotAPI):
     _client_class = storage.Client
 
+    def __init__(self, **kwargs):
+        self.bucket_cache_ttl = kwargs.pop("bucket_cache_ttl", BUCKET_CACHE_TTL)
+        self._buckets: dict[str, tuple[float, Bucket]] = {}
+        super().__init__(**kwargs)
+
+    def _build_client(self, **kwargs) -> storage.Client:
+        client = super()._build_client(**kwargs)
+        # Concurrent transfers share the client's session, so its pool must keep a connection for every worker
+        client._http.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+        return client
+
     def create_bucket(
         self,
         name: str,
@@ -36,7 +70,14 @@ class CloudStorage(GoogleCloudPilotAPI):
             return self.check_bucket(name=name)
 
     def check_bucket(self, name: str) -> Bucket:
-        return self.client.get_bucket(bucket_or_name=name)
+        # Buckets found recently are not fetched again, as they are checked before every copy
+        cached = self._buckets.get(name)
+        if cached and time.monotonic() - cached[0] < self.bucket_cache_ttl:
+            return cached[1]
+
+        bucket = self.client.get_bucket(bucket_or_name=name)
+        self._buckets[name] = (time.monotonic(), bucket)
+        return bucket
 
     def upload(
         self,
@@ -46,28 +87,58 @@ class CloudStorage(GoogleCloudPilotAPI):
         chunk_size: int | None = None,
         is_public: bool = False,
         content_type: str | None = None,
+        max_workers: int = PARALLEL_UPLOAD_MAX_WORKERS,
+        parallel_threshold: int = PARALLEL_UPLOAD_THRESHOLD,
     ) -> Blob:
-        target_bucket = self.check_bucket(name=bucket_name)
+        # The upload itself fails if the bucket is missing, so the bucket isn't fetched beforehand
+        target_bucket = self.client.bucket(bucket_name)
 
         target_file_name = target_file_name or str(source_file).rsplit("/", maxsplit=1)[-1]
         blob = target_bucket.blob(target_file_name, chunk_size=chunk_size)
 
+        # Public files are uploaded with the ACL set, instead of patching it with another request afterwards
+        predefined_acl = "publicRead" if is_public else None
         if isinstance(source_file, str):
             if source_file.startswith("http"):
-                file_obj = self._download(url=source_file)
-                blob.upload_from_file(file_obj, content_type=content_type)
+                with self._download(url=source_file) as file_obj:
+                    blob.upload_from_file(
+                        file_obj,
+                        content_type=content_type,
+                        size=self._remaining_size(file_obj),
+                        predefined_acl=predefined_acl,
+                    )
             elif Path(source_file).exists():
-                blob.upload_from_filename(source_file, content_type=content_type)
+                if Path(source_file).stat().st_size > parallel_threshold:
+                    # Large files are sent as a multipart upload of chunks uploaded concurrently.
+                    # Like composite objects, the result has no MD5 hash: only its CRC32C can be checked
+                    transfer_manager.upload_chunks_concurrently(
+                        source_file,
+                        blob,
+                        content_type=content_type,
+                        chunk_size=chunk_size or PARALLEL_UPLOAD_CHUNK_SIZE,
+                        worker_type=transfer_manager.THREAD,
+                        max_workers=max_workers,
+                    )
+                    # The multipart upload can't carry an ACL
+                    if is_public:
+                        blob.make_public()
+                else:
+                    blob.upload_from_filename(source_file, content_type=content_type, predefined_acl=predefined_acl)
             else:
-                content = io.StringIO(source_file)
-                blob.upload_from_file(content, content_type=content_type)
+                blob.upload_from_string(
+                    data=source_file.encode(),
+                    content_type=content_type,
+                    predefined_acl=predefined_acl,
+                )
         elif isinstance(source_file, bytes):
-            blob.upload_from_string(data=source_file, content_type=content_type)
+            blob.upload_from_string(data=source_file, content_type=content_type, predefined_acl=predefined_acl)
         else:
-            blob.upload_from_file(file_obj=source_file, content_type=content_type)
-
-        if is_public:
-            blob.make_public()
+            blob.upload_from_file(
+                file_obj=source_file,
+                content_type=content_type,
+                size=self._remaining_size(source_file),
+                predefined_acl=predefined_acl,
+            )
 
         return blob
 
@@ -121,18 +192,74 @@ class CloudStorage(GoogleCloudPilotAPI):
         self.delete(file_name=source_file_name, bucket_name=source_bucket_name)
         return data
 
+    def move_many(
+        self,
+        file_names: Iterable[tuple[str, str]],
+        source_bucket_name: str,
+        target_bucket_name: str,
+    ) -> list[Blob]:
+        # Each item is a (source, target) pair of file names: copies are batched, then their deletions
+        source_bucket = self.client.bucket(source_bucket_name)
+        target_bucket = self.client.bucket(target_bucket_name)
+        file_names = list(file_names)
+
+        moved = []
+        for start in range(0, len(file_names), BATCH_SIZE):
+            chunk = file_names[start : start + BATCH_SIZE]
+            with self.client.batch():
+                moved.extend(
+                    source_bucket.copy_blob(source_bucket.blob(source_file_name), target_bucket, target_file_name)
+                    for source_file_name, target_file_name in chunk
+                )
+            # Only reached if every copy of the batch succeeded
+            with self.client.batch():
+                for source_file_name, _ in chunk:
+                    source_bucket.delete_blob(source_file_name)
+        return moved
+
     def delete(self, file_name: str, bucket_name: str | None = None) -> None:
-        bucket = self.check_bucket(name=bucket_name)
-        blob = bucket.blob(file_name)
+        blob = self.client.bucket(bucket_name).blob(file_name)
         return blob.delete()
 
-    def list_files(self, bucket_name: str, prefix: str | None = None) -> Generator[Blob]:
+    def list_files(
+        self,
+        bucket_name: str,
+        prefix: str | None = None,
+        page_size: int = LIST_PAGE_SIZE,
+        fields: str | None = None,
+    ) -> Generator[Blob]:
+        # fields is a partial response (eg. "items(name),nextPageToken") to trim the metadata sent with every page
         blobs = self.client.list_blobs(
             bucket_name,
             prefix=prefix,
+            page_size=page_size,
+            fields=fields,
         )
         yield from blobs
 
+    def download_many(
+        self,
+        bucket_name: str,
+        destination_directory: str | Path,
+        prefix: str | None = None,
+        max_workers: int = DOWNLOAD_MANY_MAX_WORKERS,
+    ) -> list[str]:
+        # Folder placeholders have no content to be written as a file
+        blob_names = [
+            blob.name
+            for blob in self.list_files(bucket_name=bucket_name, prefix=prefix, fields="items(name),nextPageToken")
+            if not blob.name.endswith("/")
+        ]
+        transfer_manager.download_many_to_path(
+            self.client.bucket(bucket_name),
+            blob_names,
+            destination_directory=str(destination_directory),
+            worker_type=transfer_manager.THREAD,
+            max_workers=max_workers,
+            raise_exception=True,
+        )
+        return blob_names
+
     def get_file(self, uri: str) -> Blob:
         if not uri.startswith("gs://"):
             raise exceptions.ValidationError("GCS file must start with gs://")
@@ -143,12 +270,27 @@ class CloudStorage(GoogleCloudPilotAPI):
 
         return blob
 
-    def _download(self, url: str) -> io.BytesIO:
-        response = requests.get(url, stream=True, timeout=15)
-        file = io.BytesIO()
-        file.write(response.content)
-        file.seek(0)
-        return file
+    def _remaining_size(self, file_obj) -> int | None:
+        # A known size lets small payloads go in a single request instead of a resumable upload session
+        if isinstance(file_obj, io.TextIOBase):
+            return None
+        try:
+            position = file_obj.tell()
+            end = file_obj.seek(0, io.SEEK_END)
+            file_obj.seek(position)
+        except (AttributeError, OSError):
+            return None
+        return end - position
+
+    @contextmanager
+    def _download(self, url: str) -> Generator[IO[bytes]]:
+        # The body is streamed in chunks and only kept in memory while small, then it spills to disk
+        with tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE) as file:
+            with requests.get(url, stream=True, timeout=15) as response:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    file.write(chunk)
+            file.seek(0)
+            yield file
 
     def get_uri(self, blob: Blob) -> str:
         return f"gs://{blob.bucket.name}/{blob.name}"
@@ -159,16 +301,39 @@ class CloudStorage(GoogleCloudPilotAPI):
         blob_name: str,
         expiration: timedelta = timedelta(minutes=5),
         version: str = "v4",
-    ):
-        bucket = self.client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        return blob.generate_signed_url(
-            version=version,
+    ) -> str:
+        urls = self.get_download_urls(
+            bucket_name=bucket_name,
+            blob_names=[blob_name],
             expiration=expiration,
-            method="GET",
-            service_account_email=self.service_account_email,
-            access_token=self.token,
+            version=version,
         )
+        return urls[blob_name]
+
+    def get_download_urls(
+        self,
+        bucket_name: str,
+        blob_names: Iterable[str],
+        expiration: timedelta = timedelta(minutes=5),
+        version: str = "v4",
+    ) -> dict[str, str]:
+        bucket = self.client.bucket(bucket_name)
+        signing = self._signing_kwargs()
+        return {
+            blob_name: bucket.blob(blob_name).generate_signed_url(
+                version=version,
+                expiration=expiration,
+                method="GET",
+                **signing,
+            )
+            for blob_name in blob_names
+        }
+
+    def _signing_kwargs(self) -> dict[str, Any]:
+        # A service account key signs locally, other credentials need an IAM signBlob request for every URL
+        if isinstance(self.credentials, ServiceAccountCredentials) and self.credentials.signer is not None:
+            return {"credentials": self.credentials}
+        return {"service_account_email": self.service_account_email, "access_token": self.token}
 
 
 __all__ = ("CloudStorage",)
@@ -1,14 +1,17 @@
 # Reference: https://googleapis.dev/python/cloudtasks/latest/tasks_v2/cloud_tasks.html
+import time
 import uuid
-from collections.abc import Generator
-from datetime import UTC, datetime, timedelta
+from collections.abc import Generator, Iterable, Sequence
+from contextlib import suppress
+from datetime import timedelta
+from typing import Any
 
-from google.api_core.exceptions import FailedPrecondition, NotFound
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition, NotFound
 from google.cloud import tasks_v2
 from google.protobuf import timestamp_pb2
 
 from gcp_pilot import exceptions
-from gcp_pilot.base import AppEngineBasedService, GoogleCloudPilotAPI
+from gcp_pilot.base import AppEngineBasedService, GoogleCloudPilotAPI, _map_concurrently
 
 
 class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
@@ -37,7 +40,7 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
         self,
         queue_name: str,
         url: str,
-        payload: str = "",
+        payload: str | bytes = "",
         method: int = DEFAULT_METHOD,
         delay_in_seconds: int = 0,
         project_id: str | None = None,
@@ -48,26 +51,14 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
         headers: dict[str, str] | None = None,
         task_timeout: timedelta | None = None,
     ) -> tasks_v2.Task:
-        queue_path = self.client.queue_path(
-            project=project_id or self.project_id,
-            location=self.location,
-            queue=queue_name,
-        )
+        queue_path = self._queue_path(queue=queue_name, project_id=project_id)
         if unique and task_name:
-            task_name = f"{task_name}-{uuid.uuid4()!s}"
-
-        task_path = (
-            self.client.task_path(
-                project=project_id or self.project_id,
-                location=self.location,
-                queue=queue_name,
-                task=task_name,
-            )
-            if task_name
-            else None
-        )
+            task_name = f"{task_name}-{uuid.uuid4().hex}"
 
-        headers = headers or {}
+        task_path = self._task_path(task=task_name, queue=queue_name, project_id=project_id) if task_name else None
+
+        # Copied, so the caller's headers (eg. shared by many pushes) are never changed
+        headers = dict(headers or {})
         if content_type:
             headers["Content-Type"] = content_type
 
@@ -76,7 +67,7 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
             http_request=tasks_v2.HttpRequest(
                 http_method=method,
                 url=url,
-                body=payload.encode(),
+                body=self._as_bytes(payload),
                 headers=headers,
                 **(self.get_oidc_token(audience=url) if use_oidc_auth else {}),
             ),
@@ -86,11 +77,7 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
             task.dispatch_deadline = self.timedelta_to_duration(task_timeout)
 
         if delay_in_seconds:
-            target_date = datetime.now(tz=UTC) + timedelta(seconds=delay_in_seconds)
-            timestamp = timestamp_pb2.Timestamp()
-            timestamp.FromDatetime(target_date)
-
-            task.schedule_time = timestamp
+            task.schedule_time = timestamp_pb2.Timestamp(seconds=int(time.time()) + delay_in_seconds)
 
         try:
             response = self.client.create_task(parent=queue_path, task=task)
@@ -100,10 +87,21 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
             if exc.message != "Queue does not exist.":
                 raise
 
-            self.create_queue(queue_name=queue_name, project_id=project_id)
+            with suppress(AlreadyExists):  # created meanwhile by a concurrent push
+                self.create_queue(queue_name=queue_name, project_id=project_id)
             response = self.client.create_task(parent=queue_path, task=task)
         return response
 
+    def push_many(self, tasks: Iterable[dict[str, Any]], max_workers: int = 10) -> Sequence[tasks_v2.Task]:
+        # Each task is a dict of `push` arguments; there's no batch API, so the gRPC calls run concurrently.
+        # If any push fails, a BatchError carries the errors and created tasks by their index in `tasks`
+        results = _map_concurrently(
+            func=lambda task: self.push(**task),
+            items=dict(enumerate(tasks)),
+            max_workers=max_workers,
+        )
+        return list(results.values())
+
     def create_queue(
         self,
         queue_name: str,
@@ -132,12 +130,7 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
         return self.client.get_queue(name=queue_path)
 
     def get_task(self, queue_name: str, task_name: str, project_id: str | None = None) -> tasks_v2.Task:
-        task_path = self.client.task_path(
-            project=project_id or self.project_id,
-            location=self.location,
-            queue=queue_name,
-            task=task_name,
-        )
+        task_path = self._task_path(task=task_name, queue=queue_name, project_id=project_id)
         request = tasks_v2.GetTaskRequest(
             name=task_path,
             response_view=tasks_v2.Task.View.FULL,
@@ -151,12 +144,7 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
         project_id: str | None = None,
         not_found_ok: bool = True,
     ) -> tasks_v2.Task:
-        task_path = self.client.task_path(
-            project=project_id or self.project_id,
-            location=self.location,
-            queue=queue_name,
-            task=task_name,
-        )
+        task_path = self._task_path(task=task_name, queue=queue_name, project_id=project_id)
         request = tasks_v2.DeleteTaskRequest(
             name=task_path,
         )
@@ -167,10 +155,19 @@ class CloudTasks(AppEngineBasedService, GoogleCloudPilotAPI):
             if not not_found_ok:
                 raise
 
-    def list_tasks(self, queue_name: str, project_id: str | None = None) -> Generator[tasks_v2.Task]:
+    def list_tasks(
+        self,
+        queue_name: str,
+        project_id: str | None = None,
+        page_size: int = 1000,
+        response_view: tasks_v2.Task.View = tasks_v2.Task.View.BASIC,
+    ) -> Generator[tasks_v2.Task]:
+        # BASIC leaves out the task bodies, use FULL to fetch them as well
         queue_path = self._queue_path(queue=queue_name, project_id=project_id)
         request = tasks_v2.ListTasksRequest(
             parent=queue_path,
+            page_size=page_size,
+            response_view=response_view,
         )
         yield from self.client.list_tasks(request=request)
 
@@ -4,6 +4,12 @@ from gcp_pilot.mocker import patch_auth
 class ClientTestMixin:
     _CLIENT_KLASS = None
 
+    def setUp(self):
+        super().setUp()
+        patcher = patch_auth()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def get_client(self, **kwargs):
         return self._CLIENT_KLASS(**kwargs)
 
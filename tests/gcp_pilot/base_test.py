@@ -0,0 +1,96 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from google.oauth2.service_account import Credentials
+
+from gcp_pilot import exceptions
+from gcp_pilot.app_engine import AppEngine
+from gcp_pilot.base import _CACHED_LOCATIONS, DiscoveryCache, GoogleCloudPilotAPI
+from gcp_pilot.mocker import patch_auth
+from gcp_pilot.service_usage import ServiceUsage
+from gcp_pilot.sheets import Spreadsheet
+from gcp_pilot.source import SourceRepository
+from gcp_pilot.sql import CloudSQL
+
+
+class TestDiscoveryCache(unittest.TestCase):
+    url = "https://identitytoolkit.googleapis.com/$discovery/rest?version=v1"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_miss(self):
+        cache = DiscoveryCache(directory=self.directory.name)
+        self.assertIsNone(cache.get(url=self.url))
+
+    def test_persisted_across_instances(self):
+        DiscoveryCache(directory=self.directory.name).set(url=self.url, content='{"kind": "discovery"}')
+
+        cache = DiscoveryCache(directory=self.directory.name)
+        self.assertEqual('{"kind": "discovery"}', cache.get(url=self.url))
+        self.assertEqual(1, len(list(Path(self.directory.name).iterdir())))
+
+    def test_expired(self):
+        DiscoveryCache(directory=self.directory.name).set(url=self.url, content='{"kind": "discovery"}')
+
+        cache = DiscoveryCache(directory=self.directory.name, ttl=-1)
+        self.assertIsNone(cache.get(url=self.url))
+
+    def test_unwritable_directory(self):
+        directory = Path(self.directory.name) / "file"
+        directory.touch()
+
+        cache = DiscoveryCache(directory=directory)
+        cache.set(url=self.url, content='{"kind": "discovery"}')
+        self.assertEqual('{"kind": "discovery"}', cache.get(url=self.url))
+
+
+class TestThreadHttp(unittest.TestCase):
+    def test_scoped_credentials(self):
+        credentials = Credentials(signer=Mock(), service_account_email="chuck@norris.com", token_uri="")
+        self.assertTrue(credentials.requires_scopes)
+
+        service_usage = ServiceUsage(credentials=credentials, project_id="potato-dev", location="moon-dark1")
+
+        http_credentials = service_usage._thread_http.credentials
+        self.assertFalse(http_credentials.requires_scopes)
+        self.assertIn("https://www.googleapis.com/auth/cloud-platform", http_credentials.scopes)
+
+
+class TestProjectDefaultLocation(unittest.TestCase):
+    def test_missing_app_is_not_cached(self):
+        self.addCleanup(_CACHED_LOCATIONS.pop, "potato-dev", None)
+        locations = [exceptions.NotFound(), "moon-dark1"]
+
+        with (
+            patch_auth(),
+            patch.object(AppEngine, "_get_default_location", side_effect=locations) as get_location,
+        ):
+            repository = SourceRepository()
+            self.assertIsNone(repository._get_project_default_location())
+            self.assertEqual("moon-dark1", repository._get_project_default_location())
+            self.assertEqual("moon-dark1", repository._get_project_default_location())
+
+        self.assertEqual(2, get_location.call_count)
+
+
+class TestGetDefault(unittest.TestCase):
+    def test_one_client_per_class(self):
+        GoogleCloudPilotAPI.get_default.cache_clear()
+        self.addCleanup(GoogleCloudPilotAPI.get_default.cache_clear)
+
+        with patch_auth():
+            sql = CloudSQL.get_default()
+            self.assertIsInstance(sql, CloudSQL)
+            self.assertIs(sql, CloudSQL.get_default())
+
+            repository = SourceRepository.get_default()
+            self.assertIsInstance(repository, SourceRepository)
+            self.assertIs(repository, SourceRepository.get_default())
+
+    def test_client_with_required_arguments(self):
+        with self.assertRaisesRegex(exceptions.NotAllowed, "sheet_id"):
+            Spreadsheet.get_default()
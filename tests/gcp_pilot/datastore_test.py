@@ -1,5 +1,145 @@
 import unittest
+import warnings
+from datetime import UTC, datetime
+from unittest.mock import Mock, patch
+
+from google.cloud import datastore
+from pydantic import ConfigDict
+
+from gcp_pilot.datastore import Document, EmbeddedDocument, Manager, _get_client
+
+
+class Address(EmbeddedDocument):
+    street: str
+
+
+class Person(Document):
+    name: str
+    born_at: datetime | None = None
+    address: Address | None = None
+    tags: list[str] = []
+
+
+class Pet(Document):
+    name: str
+
+
+class Ranger(Document):
+    name: str
+
+    model_config = ConfigDict(namespace="texas")
 
 
 class TestDatastore(unittest.TestCase):
-    pass
+    def setUp(self):
+        self.client = Mock(key=lambda *path: datastore.Key(*path, project="potato-dev"))
+        patcher = patch.object(Manager, "client", self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_to_entity(self):
+        person = Person(
+            id=42,
+            name="Chuck",
+            born_at=datetime(1940, 3, 10, tzinfo=UTC),
+            address=Address(street="Walker St"),
+            tags=["ranger"],
+        )
+
+        with warnings.catch_warnings(action="error"):
+            entity = person.to_entity()
+
+        self.assertEqual(("Person", 42), entity.key.flat_path)
+        self.assertEqual("Chuck", entity["name"])
+        self.assertEqual(["ranger"], entity["tags"])
+        self.assertEqual("1940-03-10T00:00:00+00:00", entity["born_at"])
+        self.assertIsInstance(entity["address"], datastore.Entity)
+        self.assertEqual("Walker St", entity["address"]["street"])
+
+    def test_define_document(self):
+        with warnings.catch_warnings(action="error"):
+
+            class Trainee(Document):
+                name: str
+
+            self.assertEqual({"id": None, "name": "Chuck"}, Trainee(name="Chuck").to_dict())
+
+    def test_create_many(self):
+        self.client.allocate_ids.return_value = [
+            datastore.Key("Person", 1, project="potato-dev"),
+            datastore.Key("Person", 2, project="potato-dev"),
+        ]
+        items = [{"name": "Chuck"}, {"name": "Norris"}, {"id": 42, "name": "Walker"}]
+
+        with patch("gcp_pilot.datastore.MAX_ITEMS_PER_OPERATIONS", 2):
+            people = Person.documents.create_many(items=items)
+
+        self.client.allocate_ids.assert_called_once()
+        incomplete_key, num_ids = self.client.allocate_ids.call_args.args
+        self.assertEqual((("Person",), 2), (incomplete_key.flat_path, num_ids))
+        self.assertEqual([1, 2, 42], [person.pk for person in people])
+        written = [call.kwargs["entities"] for call in self.client.put_multi.call_args_list]
+        self.assertEqual([[1, 2], [42]], [[entity.key.id for entity in chunk] for chunk in written])
+
+    def test_query_fetches_every_page(self):
+        cursors = [None, b"page-2", b"page-3", None]
+        pages = [[{"name": "Chuck"}, {"name": "Norris"}], [{"name": "Walker"}], [{"name": "Ranger"}]]
+
+        def fetch(start_cursor, limit):
+            index = cursors.index(start_cursor)
+            return Mock(pages=iter([pages[index]]), next_page_token=cursors[index + 1])
+
+        self.client.query.return_value.fetch.side_effect = fetch
+        entities = list(Person.documents.query())
+
+        self.assertEqual(["Chuck", "Norris", "Walker", "Ranger"], [entity["name"] for entity in entities])
+        self.assertEqual(3, self.client.query.return_value.fetch.call_count)
+        self.assertIsNone(self.client.query.return_value.fetch.call_args.kwargs["limit"])
+
+    def test_count(self):
+        aggregation_query = self.client.aggregation_query.return_value.count.return_value
+        aggregation_query.fetch.return_value = iter([[Mock(alias="count", value=42)]])
+
+        self.assertEqual(42, Person.documents.count(name="Chuck", page_size=10))
+
+        self.client.query.return_value.add_filter.assert_called_once_with("name", "=", "Chuck")
+        self.client.aggregation_query.assert_called_once_with(self.client.query.return_value)
+        self.client.query.return_value.fetch.assert_not_called()
+
+    def test_count_with_in_filter(self):
+        entities = {"Chuck": [Mock(id=1)], "Norris": [Mock(id=1), Mock(id=2)]}
+        query = self.client.query.return_value
+        query.add_filter.side_effect = lambda field_name, operator, value: Mock(
+            fetch=lambda start_cursor, limit: Mock(pages=iter([entities[value]]), next_page_token=None)
+        )
+
+        self.assertEqual(2, Person.documents.count(name__in=["Chuck", "Norris"]))
+        self.client.aggregation_query.assert_not_called()
+        self.client.query.assert_called_once()
+
+    def test_delete_all_fetches_keys_only(self):
+        keys = [datastore.Key("Person", pk, project="potato-dev") for pk in (1, 2, 3)]
+        query = self.client.query.return_value
+        query.fetch.return_value = Mock(pages=iter([[Mock(key=key) for key in keys]]), next_page_token=None)
+
+        with patch("gcp_pilot.datastore.MAX_ITEMS_PER_OPERATIONS", 2):
+            Person.documents.delete()
+
+        query.keys_only.assert_called_once()
+        written = [call.kwargs["keys"] for call in self.client.delete_multi.call_args_list]
+        self.assertEqual([keys[:2], keys[2:]], written)
+
+
+class TestDatastoreClient(unittest.TestCase):
+    def setUp(self):
+        _get_client.cache_clear()
+        self.addCleanup(_get_client.cache_clear)
+
+    def test_client_is_shared_per_namespace(self):
+        with patch("gcp_pilot.datastore.datastore.Client", side_effect=lambda namespace: Mock()) as client:
+            managers = [Manager(doc_klass=Person), Manager(doc_klass=Pet), Manager(doc_klass=Ranger)]
+            clients = [manager.client for manager in managers]
+
+        self.assertIs(clients[0], clients[1])
+        self.assertIsNot(clients[0], clients[2])
+        self.assertEqual([None, "texas"], [call.kwargs["namespace"] for call in client.call_args_list])
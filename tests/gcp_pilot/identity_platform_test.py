@@ -1,6 +1,7 @@
 import json
 import unittest
 from datetime import UTC, datetime
+from functools import cache
 from pathlib import Path
 
 from gcp_pilot.factories.identity_platform import FirebaseAuthTokenFactory
@@ -9,6 +10,12 @@ from gcp_pilot.mocker import patch_firebase_token
 from tests import ClientTestMixin
 
 
+@cache
+def _load_sample_json(sample_name: str) -> dict:
+    sample_path = Path(__file__).parent / "samples" / "identity_platform" / f"{sample_name}.json"
+    return json.loads(sample_path.read_bytes())
+
+
 class TestParseTimestamp(unittest.TestCase):
     def test_parse_timestamp(self):
         sometime = datetime(2022, 5, 17, 1, 2, 57, tzinfo=UTC)
@@ -22,8 +29,7 @@ class TestIdentityPlatform(ClientTestMixin, unittest.TestCase):
 
     @classmethod
     def _load_sample_token(cls, sample_name: str) -> tuple[dict, FirebaseAuthToken]:
-        sample_path = Path(__file__).parent / "samples" / "identity_platform" / f"{sample_name}.json"
-        token_data = json.load(sample_path.open())
+        token_data = _load_sample_json(sample_name)
         with patch_firebase_token(return_value=token_data):
             return token_data, FirebaseAuthToken(jwt_token="potato")
 
@@ -79,17 +85,16 @@ class TestIdentityPlatform(ClientTestMixin, unittest.TestCase):
             self.assertFalse("tenant_id" in expected_data["user_record"])
             self.assertIsNone(token.user.tenant_id)
 
-    def test_parse_tenant_oidc_signin_token(self):
-        token_data, token = self._load_sample_token("firebase_tenant_oidc_signin_decoded_token")
-        self.assert_expected_sample_token(expected_data=token_data, token=token, is_tenant=True)
-
-    def test_parse_tenant_signin_token(self):
-        token_data, token = self._load_sample_token("firebase_tenant_signin_decoded_token")
-        self.assert_expected_sample_token(expected_data=token_data, token=token, is_tenant=True)
-
-    def test_parse_signin_token(self):
-        token_data, token = self._load_sample_token("firebase_signin_decoded_token")
-        self.assert_expected_sample_token(expected_data=token_data, token=token, is_tenant=False)
+    def test_parse_sample_token(self):
+        samples = [
+            ("firebase_tenant_oidc_signin_decoded_token", True),
+            ("firebase_tenant_signin_decoded_token", True),
+            ("firebase_signin_decoded_token", False),
+        ]
+        for sample_name, is_tenant in samples:
+            with self.subTest(sample=sample_name):
+                token_data, token = self._load_sample_token(sample_name)
+                self.assert_expected_sample_token(expected_data=token_data, token=token, is_tenant=is_tenant)
 
     def test_parse_firebase_factory_token(self):
         iat = int(datetime.now(tz=UTC).timestamp())
@@ -1,5 +1,27 @@
 import unittest
 
+import google.auth
+
+from gcp_pilot.mocker import patch_auth
+
 
 class TestMocker(unittest.TestCase):
-    pass
+    def test_patch_auth_decorator_patches_only_during_calls(self):
+        original = google.auth.default
+
+        @patch_auth(project_id="chuck-dev")
+        def get_project():
+            return google.auth.default()[1]
+
+        self.assertIs(original, google.auth.default)
+        self.assertEqual("chuck-dev", get_project())
+        self.assertEqual("chuck-dev", get_project())
+        self.assertIs(original, google.auth.default)
+
+    def test_patch_auth_context(self):
+        original = google.auth.default
+
+        with patch_auth():
+            self.assertEqual("potato-dev", google.auth.default()[1])
+
+        self.assertIs(original, google.auth.default)
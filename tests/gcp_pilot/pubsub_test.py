@@ -1,13 +1,41 @@
 import json
 import unittest
+from unittest.mock import patch
 
-from gcp_pilot.pubsub import CloudPublisher, CloudSubscriber, Message
+from google.pubsub_v1 import Topic
+
+from gcp_pilot.pubsub import DEFAULT_BATCH_SETTINGS, CloudPublisher, CloudSubscriber, Message
 from tests import ClientTestMixin
 
 
 class TestCloudPublisher(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = CloudPublisher
 
+    def test_batch_settings(self):
+        publisher = self.get_client()
+        self.assertEqual(DEFAULT_BATCH_SETTINGS, publisher.client.batch_settings)
+
+        publisher = self.get_client(max_latency=0.05)
+        self.assertEqual(DEFAULT_BATCH_SETTINGS._replace(max_latency=0.05), publisher.client.batch_settings)
+
+    def test_get_default(self):
+        CloudPublisher.get_default.cache_clear()
+        self.addCleanup(CloudPublisher.get_default.cache_clear)
+        publisher = CloudPublisher.get_default()
+        self.assertIsInstance(publisher, CloudPublisher)
+        self.assertIs(publisher, CloudPublisher.get_default())
+
+    def test_list_topics(self):
+        names = ["chuck-events", "chuck-logs", "norris-events"]
+        topics = [Topic(name=f"projects/potato-dev/topics/{name}") for name in names]
+
+        publisher = self.get_client()
+        with patch.object(publisher.client, "list_topics", return_value=topics):
+            self.assertEqual(topics, list(publisher.list_topics()))
+            self.assertEqual(topics[:2], list(publisher.list_topics(prefix="chuck")))
+            self.assertEqual(topics[::2], list(publisher.list_topics(suffix="events")))
+            self.assertEqual(topics[:1], list(publisher.list_topics(prefix="chuck", suffix="events")))
+
 
 class TestCloudSubscriber(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = CloudSubscriber
@@ -1,8 +1,71 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
+from gcp_pilot import exceptions
 from gcp_pilot.resource import ResourceManager
 from tests import ClientTestMixin
 
 
 class TestResourceManager(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = ResourceManager
+
+    def test_get_default(self):
+        ResourceManager.get_default.cache_clear()
+        self.addCleanup(ResourceManager.get_default.cache_clear)
+        resource_manager = ResourceManager.get_default()
+        self.assertIsInstance(resource_manager, ResourceManager)
+        self.assertIs(resource_manager, ResourceManager.get_default())
+
+    def test_add_member_to_projects(self):
+        project_ids = ["potato-dev", "potato-stg", "potato-prd"]
+
+        with (
+            patch.object(ResourceManager, "get_policy", return_value={"bindings": []}) as get_policy,
+            patch.object(ResourceManager, "set_policy", side_effect=lambda policy, project_id: policy) as set_policy,
+        ):
+            policies = self.get_client().add_member_to_projects(
+                email="chuck@norris.com",
+                role="viewer",
+                project_ids=project_ids,
+            )
+
+        expected_policy = {"bindings": [{"role": "roles/viewer", "members": ["member:chuck@norris.com"]}], "version": 1}
+        self.assertEqual({project_id: expected_policy for project_id in project_ids}, policies)
+        self.assertEqual(len(project_ids), get_policy.call_count)
+        self.assertEqual(len(project_ids), set_policy.call_count)
+
+    def test_add_member_to_projects_with_failures(self):
+        project_ids = ["potato-dev", "potato-stg", "potato-prd"]
+        error = exceptions.NotAllowed("potato-stg")
+
+        def set_policy(policy, project_id):
+            if project_id == "potato-stg":
+                raise error
+            return policy
+
+        with (
+            patch.object(ResourceManager, "get_policy", return_value={"bindings": []}),
+            patch.object(ResourceManager, "set_policy", side_effect=set_policy) as set_policy_mock,
+            self.assertRaises(exceptions.BatchError) as context,
+        ):
+            self.get_client().add_member_to_projects(email="chuck@norris.com", role="viewer", project_ids=project_ids)
+
+        self.assertEqual(len(project_ids), set_policy_mock.call_count)
+        self.assertEqual({"potato-stg": error}, context.exception.errors)
+        self.assertEqual(["potato-dev", "potato-prd"], sorted(context.exception.results))
+
+    def test_set_policy_without_bindings(self):
+        resource_manager = self.get_client()
+        for policy in ({}, {"bindings": []}):
+            with self.subTest(policy=policy), self.assertRaises(exceptions.NotAllowed):
+                resource_manager.set_policy(policy=policy)
+
+    def test_thread_http(self):
+        resource_manager = self.get_client()
+
+        self.assertIs(resource_manager._thread_http, resource_manager._thread_http)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other_thread_http = executor.submit(lambda: resource_manager._thread_http).result()
+        self.assertIsNot(resource_manager._thread_http, other_thread_http)
+        self.assertIs(resource_manager.client._http.credentials, other_thread_http.credentials)
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 
 from gcp_pilot.run import CloudRun
 from tests import ClientTestMixin
@@ -6,3 +7,46 @@ from tests import ClientTestMixin
 
 class TestCloudRun(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = CloudRun
+
+    def test_localized_client_is_reused(self):
+        run = self.get_client()
+
+        client = run._get_localized_client(location="moon-dark1")
+        self.assertEqual("https://moon-dark1-run.googleapis.com", client._baseUrl)
+        self.assertIs(client, run._get_localized_client(location="moon-dark1"))
+        self.assertIsNot(client, run._get_localized_client(location="moon-light1"))
+
+    def test_project_default_location_is_memoized(self):
+        run = self.get_client()
+
+        with patch("gcp_pilot.app_engine.AppEngine._get_default_location", return_value="moon-dark1") as lookup:
+            first = run._get_localized_client(project_id="potato-memo")
+            second = run._get_localized_client(project_id="potato-memo")
+
+        self.assertIs(first, second)
+        lookup.assert_called_once_with()
+
+    def test_list_services_follows_continue_token(self):
+        pages = [
+            {"items": [{"metadata": {"name": "chuck"}}], "metadata": {"continue": "page-2"}},
+            {"items": [{"metadata": {"name": "norris"}}], "metadata": {}},
+        ]
+
+        run = self.get_client()
+        with patch.object(CloudRun, "_execute", side_effect=pages) as execute:
+            services = list(run.list_services())
+
+        self.assertEqual(["chuck", "norris"], [service["metadata"]["name"] for service in services])
+        self.assertEqual(2, execute.call_count)
+        self.assertNotIn("continue", execute.call_args_list[0].kwargs)
+        self.assertEqual("page-2", execute.call_args_list[1].kwargs["continue"])
+
+    def test_list_collections_are_reused(self):
+        run = self.get_client()
+        with patch.object(CloudRun, "_execute", return_value={"items": []}) as execute:
+            list(run.list_revisions(service_name="chuck"))
+            list(run.list_revisions(service_name="norris"))
+
+        first, second = (call.kwargs["method"] for call in execute.call_args_list)
+        self.assertIs(first.__self__, second.__self__)
+        self.assertEqual("serving.knative.dev/service=norris", execute.call_args.kwargs["labelSelector"])
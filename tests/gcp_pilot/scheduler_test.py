@@ -1,8 +1,90 @@
 import unittest
+from unittest.mock import patch
 
+from google.api_core.exceptions import NotFound, PermissionDenied
+from google.cloud import scheduler_v1
+
+from gcp_pilot import exceptions
 from gcp_pilot.scheduler import CloudScheduler
 from tests import ClientTestMixin
 
 
 class TestCloudScheduler(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = CloudScheduler
+
+    def test_put_many(self):
+        jobs = [
+            {"name": "chuck", "url": "https://chuck.norris.com", "payload": "{}", "cron": "* * * * *"},
+            {"name": "norris", "url": "https://chuck.norris.com", "payload": "{}", "cron": "0 * * * *"},
+        ]
+
+        scheduler = self.get_client(location="moon-dark1")
+        with (
+            patch.object(scheduler.client, "update_job", side_effect=NotFound("")) as update_job,
+            patch.object(scheduler.client, "create_job", side_effect=lambda request: request["job"]) as create_job,
+        ):
+            created = scheduler.put_many(jobs=jobs, max_workers=2)
+
+        self.assertEqual(2, update_job.call_count)
+        self.assertEqual(2, create_job.call_count)
+        self.assertEqual(
+            [
+                "projects/potato-dev/locations/moon-dark1/jobs/chuck",
+                "projects/potato-dev/locations/moon-dark1/jobs/norris",
+            ],
+            [job.name for job in created],
+        )
+
+    def test_put_many_with_failures(self):
+        jobs = [
+            {"name": "chuck", "url": "https://chuck.norris.com", "payload": "{}", "cron": "* * * * *"},
+            {"name": "norris", "url": "https://chuck.norris.com", "payload": "{}", "cron": "0 * * * *"},
+            {"name": "walker", "url": "https://chuck.norris.com", "payload": "{}", "cron": "0 0 * * *"},
+        ]
+        error = PermissionDenied("")
+
+        def update_job(job):
+            if job.name.endswith("/norris"):
+                raise error
+            return job
+
+        scheduler = self.get_client(location="moon-dark1")
+        with (
+            patch.object(scheduler.client, "update_job", side_effect=update_job) as update_job_mock,
+            self.assertRaises(exceptions.BatchError) as context,
+        ):
+            scheduler.put_many(jobs=jobs, max_workers=2)
+
+        self.assertEqual(3, update_job_mock.call_count)
+        self.assertEqual({1: error}, context.exception.errors)
+        self.assertEqual([0, 2], sorted(context.exception.results))
+
+    def test_put_builds_job_once(self):
+        scheduler = self.get_client(location="moon-dark1")
+        with (
+            patch.object(scheduler, "_build_job", wraps=scheduler._build_job) as build_job,
+            patch.object(scheduler.client, "update_job", side_effect=NotFound("")) as update_job,
+            patch.object(scheduler.client, "create_job", side_effect=lambda request: request["job"]) as create_job,
+        ):
+            job = scheduler.put(name="chuck", url="https://chuck.norris.com", payload=b"{}", cron="* * * * *")
+
+        build_job.assert_called_once()
+        self.assertIs(job, update_job.call_args.kwargs["job"])
+        self.assertIs(job, create_job.call_args.kwargs["request"]["job"])
+        self.assertEqual(b"{}", job.http_target.body)
+
+    def test_list_with_fields(self):
+        jobs = [
+            scheduler_v1.Job(name="projects/potato-dev/locations/moon-dark1/jobs/chuck-1"),
+            scheduler_v1.Job(name="projects/potato-dev/locations/moon-dark1/jobs/norris-1"),
+        ]
+
+        scheduler = self.get_client(location="moon-dark1")
+        with patch.object(scheduler.client, "list_jobs", return_value=iter(jobs)) as list_jobs:
+            found = list(scheduler.list(prefix="chuck", fields="jobs.name,next_page_token"))
+
+        self.assertEqual(jobs[:1], found)
+        list_jobs.assert_called_once_with(
+            request={"parent": "projects/potato-dev/locations/moon-dark1"},
+            metadata=[("x-goog-fieldmask", "jobs.name,next_page_token")],
+        )
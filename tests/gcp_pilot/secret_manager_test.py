@@ -1,4 +1,7 @@
 import unittest
+from unittest.mock import patch
+
+from google.cloud.secretmanager import AccessSecretVersionResponse, Secret, SecretPayload
 
 from gcp_pilot.secret_manager import SecretManager
 from tests import ClientTestMixin
@@ -6,3 +9,62 @@ from tests import ClientTestMixin
 
 class TestSecretManager(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = SecretManager
+
+    def test_list_secrets(self):
+        names = ["chuck-api-key", "chuck-password", "norris-api-key"]
+        secrets = [Secret(name=f"projects/potato-dev/secrets/{name}") for name in names]
+
+        def access_secret_version(request):
+            key = request["name"].split("/")[3]
+            return AccessSecretVersionResponse(payload=SecretPayload(data=f"value-of-{key}".encode()))
+
+        secret_manager = self.get_client()
+        with (
+            patch.object(secret_manager.client, "list_secrets", return_value=secrets),
+            patch.object(secret_manager.client, "access_secret_version", side_effect=access_secret_version),
+        ):
+            self.assertEqual(
+                [(name, f"value-of-{name}") for name in names],
+                list(secret_manager.list_secrets()),
+            )
+            self.assertEqual(
+                [("chuck-api-key", "value-of-chuck-api-key")],
+                list(secret_manager.list_secrets(prefix="chuck", suffix="key")),
+            )
+
+    def test_list_secrets_stops_early(self):
+        secrets = [Secret(name=f"projects/potato-dev/secrets/chuck-{i}") for i in range(50)]
+        value = AccessSecretVersionResponse(payload=SecretPayload(data=b"potato"))
+
+        secret_manager = self.get_client()
+        with (
+            patch.object(secret_manager.client, "list_secrets", return_value=secrets),
+            patch.object(secret_manager.client, "access_secret_version", return_value=value) as access,
+        ):
+            listing = secret_manager.list_secrets(max_workers=2)
+            self.assertEqual(("chuck-0", "potato"), next(listing))
+            listing.close()
+
+        self.assertLessEqual(access.call_count, 2)
+
+    def test_list_secrets_streams_names(self):
+        secrets = iter([Secret(name=f"projects/potato-dev/secrets/chuck-{i}") for i in range(50)])
+        value = AccessSecretVersionResponse(payload=SecretPayload(data=b"potato"))
+
+        secret_manager = self.get_client()
+        with (
+            patch.object(secret_manager.client, "list_secrets", return_value=secrets),
+            patch.object(secret_manager.client, "access_secret_version", return_value=value),
+        ):
+            listing = secret_manager.list_secrets(max_workers=2)
+            next(listing)
+            listing.close()
+
+        self.assertEqual(48, len(list(secrets)))
+
+    def test_shared_transport(self):
+        secret_manager = self.get_client()
+        other_secret_manager = self.get_client()
+
+        self.assertIsNot(secret_manager.client, other_secret_manager.client)
+        self.assertIs(secret_manager.client.transport, other_secret_manager.client.transport)
@@ -0,0 +1,36 @@
+import unittest
+from unittest.mock import patch
+
+from gcp_pilot.service_usage import ServiceUsage
+from tests import ClientTestMixin
+
+
+class TestServiceUsage(ClientTestMixin, unittest.TestCase):
+    _CLIENT_KLASS = ServiceUsage
+
+    def test_enable_services(self):
+        service_usage = self.get_client()
+        service_names = (name for name in ["run.googleapis.com", "pubsub.googleapis.com"])
+
+        with patch.object(ServiceUsage, "_execute", return_value={"name": "operations/potato"}) as execute:
+            operations = service_usage.enable_services(service_names=service_names)
+
+        self.assertEqual([{"name": "operations/potato"}], operations)
+        execute.assert_called_once()
+        kwargs = execute.call_args.kwargs
+        request = kwargs.pop("method")(**kwargs)
+        self.assertEqual("serviceusage.services.batchEnable", request.methodId)
+        self.assertEqual("projects/potato-dev", kwargs["parent"])
+        self.assertEqual({"serviceIds": ["run.googleapis.com", "pubsub.googleapis.com"]}, kwargs["body"])
+
+    def test_enable_services_in_batches(self):
+        service_usage = self.get_client()
+        service_names = [f"service-{i}.googleapis.com" for i in range(45)]
+
+        with patch.object(ServiceUsage, "_execute", return_value={"name": "operations/potato"}) as execute:
+            operations = service_usage.enable_services(service_names=service_names)
+
+        self.assertEqual(3, len(operations))
+        batches = [call.kwargs["body"]["serviceIds"] for call in execute.call_args_list]
+        self.assertEqual([20, 20, 5], [len(batch) for batch in batches])
+        self.assertEqual(service_names, [name for batch in batches for name in batch])
@@ -1,7 +1,6 @@
 import unittest
 from unittest.mock import Mock, patch
 
-from gcp_pilot.mocker import patch_auth
 from gcp_pilot.sheets import Spreadsheet
 from tests import ClientTestMixin
 
@@ -13,7 +12,6 @@ class TestSheets(ClientTestMixin, unittest.TestCase):
         with patch("gspread.Spreadsheet.fetch_sheet_metadata", return_value={"properties": {}}):
             return super().get_client(sheet_id="chuck_norris")
 
-    @patch_auth()
     def test_init_sheet_id(self):
         sheet_id = "1x36dOSowEOopieX0rvMewWEzhd29z2lMLtn38xhWZJU"
         sheet_url = "https://docs.google.com/spreadsheets/d/1x36dOSowEOopieX0rvMewWEzhd29z2lMLtn38xhWZJU/edit"
@@ -24,9 +22,12 @@ class TestSheets(ClientTestMixin, unittest.TestCase):
 
         self.assertEqual(sheet_id, spreadsheet.sheet_id)
         self.assertEqual(sheet_url, spreadsheet.url)
+        gclient.open_by_key.assert_not_called()
+
+        self.assertEqual(gclient.open_by_key.return_value, spreadsheet.spreadsheet)
+        self.assertEqual(gclient.open_by_key.return_value, spreadsheet.spreadsheet)
         gclient.open_by_key.assert_called_once_with(sheet_id)
 
-    @patch_auth()
     def test_init_sheet_url(self):
         sheet_id = "1x36dOSowEOopieX0rvMewWEzhd29z2lMLtn38xhWZJU"
         sheet_url = "https://docs.google.com/spreadsheets/d/1x36dOSowEOopieX0rvMewWEzhd29z2lMLtn38xhWZJU/edit"
@@ -37,4 +38,51 @@ class TestSheets(ClientTestMixin, unittest.TestCase):
 
         self.assertEqual(sheet_id, spreadsheet.sheet_id)
         self.assertEqual(sheet_url, spreadsheet.url)
+        gclient.open_by_key.assert_not_called()
+
+        self.assertEqual(gclient.open_by_key.return_value, spreadsheet.spreadsheet)
+        self.assertEqual(gclient.open_by_key.return_value, spreadsheet.spreadsheet)
         gclient.open_by_key.assert_called_once_with(sheet_id)
+
+    def test_worksheet_is_cached(self):
+        gclient = Mock(spec=["open_by_key"])
+        with patch("gspread.Client", return_value=gclient):
+            spreadsheet = self._CLIENT_KLASS("chuck_norris")
+
+        workbook = gclient.open_by_key.return_value
+        self.assertEqual(workbook.worksheet.return_value, spreadsheet.worksheet("Sheet1"))
+        self.assertEqual(workbook.worksheet.return_value, spreadsheet.worksheet("Sheet1"))
+        workbook.worksheet.assert_called_once_with("Sheet1")
+
+        spreadsheet.refresh()
+        spreadsheet.worksheet("Sheet1")
+        self.assertEqual(2, gclient.open_by_key.call_count)
+        self.assertEqual(2, workbook.worksheet.call_count)
+
+    def test_batch_get(self):
+        gclient = Mock(spec=["open_by_key", "http_client"])
+        gclient.http_client.values_batch_get.return_value = {
+            "spreadsheetId": "chuck_norris",
+            "valueRanges": [
+                {"range": "Sheet1!A1:B2", "values": [["a", "b"], ["c", "d"]]},
+                {"range": "Sheet2!A1:B2"},
+            ],
+        }
+        with patch("gspread.Client", return_value=gclient):
+            spreadsheet = self._CLIENT_KLASS("chuck_norris")
+
+        values = spreadsheet.batch_get(ranges=["Sheet1!A1:B2", "Sheet2!A1:B2"])
+
+        self.assertEqual([[["a", "b"], ["c", "d"]], []], values)
+        gclient.http_client.values_batch_get.assert_called_once_with("chuck_norris", ["Sheet1!A1:B2", "Sheet2!A1:B2"])
+        gclient.open_by_key.assert_not_called()
+
+    def test_client_session(self):
+        spreadsheet = self.get_client()
+
+        session = spreadsheet.client.http_client.session
+        self.assertIs(spreadsheet.credentials, session.credentials)
+        adapter = session.get_adapter("https://sheets.googleapis.com")
+        self.assertEqual(32, adapter._pool_maxsize)
+        self.assertEqual(3, adapter.max_retries.total)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
@@ -1,8 +1,64 @@
 import unittest
+from unittest.mock import patch
 
-from gcp_pilot.speech import Speech
+from google.cloud.speech_v1 import (
+    SpeechRecognitionAlternative,
+    SpeechRecognitionResult,
+    StreamingRecognitionResult,
+    StreamingRecognizeResponse,
+)
+
+from gcp_pilot.speech import MAX_CONTENT_SIZE, STREAM_CHUNK_SIZE, Speech
 from tests import ClientTestMixin
 
 
 class TestSpeechClient(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = Speech
+
+    def test_large_file_is_streamed(self):
+        flac_content = b"0" * (MAX_CONTENT_SIZE + 1)
+        chunks = []
+
+        def streaming_recognize(config, requests):
+            chunks.extend(request.audio_content for request in requests)
+            yield StreamingRecognizeResponse(
+                results=[
+                    StreamingRecognitionResult(
+                        alternatives=[SpeechRecognitionAlternative(transcript="chuck")],
+                        is_final=False,
+                    ),
+                    StreamingRecognitionResult(
+                        alternatives=[SpeechRecognitionAlternative(transcript="chuck norris")],
+                        is_final=True,
+                    ),
+                ],
+            )
+
+        speech = self.get_client()
+        with (
+            patch.object(speech.client, "streaming_recognize", side_effect=streaming_recognize),
+            patch.object(speech.client, "recognize") as recognize,
+        ):
+            transcripts = speech.speech_file_to_text(flac_content=flac_content)
+
+        self.assertEqual(["chuck norris"], transcripts)
+        recognize.assert_not_called()
+        self.assertEqual(flac_content, b"".join(chunks))
+        self.assertEqual(STREAM_CHUNK_SIZE, max(len(chunk) for chunk in chunks))
+
+    def test_large_file_long_running(self):
+        flac_content = b"0" * (MAX_CONTENT_SIZE + 1)
+
+        speech = self.get_client()
+        with (
+            patch.object(speech.client, "long_running_recognize") as long_running_recognize,
+            patch.object(speech.client, "streaming_recognize") as streaming_recognize,
+        ):
+            long_running_recognize.return_value.result.return_value.results = [
+                SpeechRecognitionResult(alternatives=[SpeechRecognitionAlternative(transcript="chuck norris")]),
+            ]
+            transcripts = speech.speech_file_to_text(flac_content=flac_content, long_running=True)
+
+        self.assertEqual(["chuck norris"], transcripts)
+        streaming_recognize.assert_not_called()
+        self.assertEqual(flac_content, long_running_recognize.call_args.kwargs["audio"].content)
@@ -1,8 +1,228 @@
+import json
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+from gcp_pilot import exceptions
 from gcp_pilot.sql import CloudSQL
 from tests import ClientTestMixin
 
 
 class TestCloudSQL(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = CloudSQL
+
+    def _create_instance(self, sql: CloudSQL):
+        return sql.create_instance(name="chuck", version="POSTGRES_16", tier="db-f1-micro", region="moon-dark1")
+
+    def test_create_instance_watches_operation(self):
+        operations = [
+            {"name": "op-1", "status": "PENDING"},
+            {"name": "op-1", "status": "RUNNING"},
+            {"name": "op-1", "status": "RUNNING"},
+            {"name": "op-1", "status": "DONE"},
+        ]
+
+        sql = self.get_client()
+        with (
+            patch.object(CloudSQL, "_execute", side_effect=operations) as execute,
+            patch.object(CloudSQL, "get_instance", return_value={"state": "RUNNABLE"}) as get_instance,
+            patch("gcp_pilot.sql.random.uniform", return_value=0),
+            patch("gcp_pilot.sql.time.sleep") as sleep,
+        ):
+            instance = self._create_instance(sql=sql)
+
+        self.assertEqual({"state": "RUNNABLE"}, instance)
+        get_instance.assert_called_once_with(name="chuck", project_id=None)
+        self.assertEqual(4, execute.call_count)
+        self.assertEqual("op-1", execute.call_args.kwargs["operation"])
+        self.assertEqual([1.0, 2.0, 4.0], [call.args[0] for call in sleep.call_args_list])
+
+    def test_create_instance_operation_error(self):
+        operations = [
+            {"name": "op-1", "status": "PENDING"},
+            {"name": "op-1", "status": "DONE", "error": {"errors": [{"code": "INTERNAL_ERROR"}]}},
+        ]
+
+        sql = self.get_client()
+        with (
+            patch.object(CloudSQL, "_execute", side_effect=operations),
+            patch.object(CloudSQL, "get_instance") as get_instance,
+            patch("gcp_pilot.sql.time.sleep"),
+            self.assertRaises(exceptions.OperationError),
+        ):
+            self._create_instance(sql=sql)
+
+        get_instance.assert_not_called()
+
+    def test_create_existing_instance_backs_off(self):
+        states = [{"state": "PENDING_CREATE"}] * 3 + [{"state": "RUNNABLE"}]
+
+        sql = self.get_client()
+        with (
+            patch.object(CloudSQL, "_execute", side_effect=exceptions.AlreadyExists()),
+            patch.object(CloudSQL, "get_instance", side_effect=states) as get_instance,
+            patch("gcp_pilot.sql.random.uniform", return_value=0),
+            patch("gcp_pilot.sql.time.sleep") as sleep,
+        ):
+            instance = self._create_instance(sql=sql)
+
+        self.assertEqual({"state": "RUNNABLE"}, instance)
+        self.assertEqual(4, get_instance.call_count)
+        self.assertEqual([1.0, 2.0, 4.0], [call.args[0] for call in sleep.call_args_list])
+
+    def test_create_instance_times_out(self):
+        sql = self.get_client(poll_timeout=0)
+        with (
+            patch.object(CloudSQL, "_execute", return_value={"name": "op-1", "status": "PENDING"}) as execute,
+            patch.object(CloudSQL, "get_instance") as get_instance,
+            self.assertRaises(exceptions.OperationTimeout),
+        ):
+            self._create_instance(sql=sql)
+
+        execute.assert_called_once()
+        get_instance.assert_not_called()
+
+    def test_delete_ssl_certs(self):
+        certs = [
+            {"commonName": "chuck", "sha1Fingerprint": "c4u2k"},
+            {"commonName": "norris", "sha1Fingerprint": "n0rr15"},
+            {"commonName": "potato", "sha1Fingerprint": "p0t4t0"},
+            {"commonName": "chuck", "sha1Fingerprint": "d0ubl3"},
+        ]
+
+        def execute(batch, http=None):
+            for request_id in batch._order:
+                batch._callback(request_id, {"targetId": batch._requests[request_id].uri}, None)
+
+        sql = self.get_client()
+        with (
+            patch.object(CloudSQL, "list_ssl_certs", return_value=iter(certs)) as list_ssl_certs,
+            patch("googleapiclient.http.BatchHttpRequest.execute", autospec=True, side_effect=execute) as batch,
+        ):
+            deleted = sql.delete_ssl_certs(instance="chuck-db", ssl_names=["chuck", "potato", "ghost"])
+
+        list_ssl_certs.assert_called_once()
+        batch.assert_called_once()
+        self.assertEqual(["chuck", "potato"], list(deleted))
+        self.assertIn("/projects/potato-dev/instances/chuck-db/sslCerts/c4u2k?", deleted["chuck"]["targetId"])
+        self.assertIn("/projects/potato-dev/instances/chuck-db/sslCerts/p0t4t0?", deleted["potato"]["targetId"])
+
+    def test_delete_ssl_certs_with_failures(self):
+        certs = [
+            {"commonName": "chuck", "sha1Fingerprint": "c4u2k"},
+            {"commonName": "norris", "sha1Fingerprint": "n0rr15"},
+            {"commonName": "potato", "sha1Fingerprint": "p0t4t0"},
+        ]
+        error = HttpError(resp=Response({"status": 403}), content=b'{"error": {"code": 403}}')
+
+        def execute(batch, http=None):
+            for request_id in batch._order:
+                if request_id == "norris":
+                    batch._callback(request_id, None, error)
+                else:
+                    batch._callback(request_id, {"targetId": batch._requests[request_id].uri}, None)
+
+        sql = self.get_client()
+        with (
+            patch.object(CloudSQL, "list_ssl_certs", return_value=iter(certs)),
+            patch("googleapiclient.http.BatchHttpRequest.execute", autospec=True, side_effect=execute),
+            self.assertRaises(exceptions.BatchError) as context,
+        ):
+            sql.delete_ssl_certs(instance="chuck-db", ssl_names=["chuck", "norris", "potato"])
+
+        self.assertEqual({"norris": error}, context.exception.errors)
+        self.assertEqual(["chuck", "potato"], list(context.exception.results))
+
+    def test_delete_ssl_certs_not_found(self):
+        sql = self.get_client()
+        with (
+            patch.object(CloudSQL, "list_ssl_certs", return_value=iter([])),
+            self.assertRaises(exceptions.NotFound),
+        ):
+            sql.delete_ssl_certs(instance="chuck-db", ssl_names=["ghost"], not_found_ok=False)
+
+    def test_batch(self):
+        def execute(batch, http=None):
+            for request_id in batch._order:
+                request = batch._requests[request_id]
+                batch._callback(request_id, {"targetLink": request.uri, "body": request.body}, None)
+
+        sql = self.get_client()
+        with (
+            patch("googleapiclient.http.BatchHttpRequest.execute", autospec=True, side_effect=execute) as execute,
+            sql.batch() as batch,
+        ):
+            database_request = sql.create_database(name="chuck", instance="chuck-db", batch=batch)
+            user_request = sql.create_user(name="norris", password="roundhouse", instance="chuck-db", batch=batch)
+            execute.assert_not_called()
+
+        execute.assert_called_once()
+        self.assertEqual(2, len(batch.responses))
+        self.assertIn("/instances/chuck-db/databases?", batch.responses[database_request]["targetLink"])
+        self.assertIn("/instances/chuck-db/users?", batch.responses[user_request]["targetLink"])
+        self.assertIn('"name": "norris"', batch.responses[user_request]["body"])
+
+    def test_concurrent_waits_share_a_poller(self):
+        joined = threading.Event()
+
+        class Waiters(dict):
+            def get(self, key, default=None):
+                waiter = super().get(key, default)
+                if waiter is not None:
+                    joined.set()
+                return waiter
+
+        def get_instance(name, project_id):
+            joined.wait(timeout=5)
+            return {"state": "RUNNABLE"}
+
+        sql = self.get_client()
+        with (
+            patch("gcp_pilot.sql._INSTANCE_WAITERS", Waiters()),
+            patch.object(CloudSQL, "get_instance", side_effect=get_instance) as get_instance,
+            patch("gcp_pilot.sql.time.sleep"),
+            ThreadPoolExecutor(max_workers=2) as executor,
+        ):
+            futures = [
+                executor.submit(sql._wait_runnable, name="chuck", project_id=None, current_state="PENDING_CREATE")
+                for _ in range(2)
+            ]
+            results = [future.result(timeout=10) for future in futures]
+
+        self.assertTrue(joined.is_set())
+        self.assertEqual([{"state": "RUNNABLE"}] * 2, results)
+        get_instance.assert_called_once()
+
+    def test_create_database_fallbacks(self):
+        errors = {
+            "not running": {"code": 400, "message": "Invalid request since instance is not running."},
+            "not ready": {"code": 400, "message": "Not ready.", "errors": [{"reason": "instanceNotReady"}]},
+            "already exists": {"code": 400, "message": "Database chuck already exists."},
+            "duplicate": {"code": 409, "message": "Duplicated.", "errors": [{"reason": "duplicate"}]},
+        }
+
+        sql = self.get_client()
+        for case, error in errors.items():
+            exc = HttpError(resp=Response({"status": error["code"]}), content=json.dumps({"error": error}).encode())
+            with (
+                self.subTest(case=case),
+                patch("googleapiclient.http.HttpRequest.execute", side_effect=exc),
+                patch.object(CloudSQL, "get_database", return_value={"name": "chuck"}) as get_database,
+            ):
+                self.assertEqual({"name": "chuck"}, sql.create_database(name="chuck", instance="chuck-db"))
+                get_database.assert_called_once_with(instance="chuck-db", database="chuck", project_id=None)
+
+    def test_create_database_error(self):
+        error = {"code": 400, "message": "Database chuck already exists."}
+        exc = HttpError(resp=Response({"status": 400}), content=json.dumps({"error": error}).encode())
+
+        sql = self.get_client()
+        with (
+            patch("googleapiclient.http.HttpRequest.execute", side_effect=exc),
+            self.assertRaises(HttpError),
+        ):
+            sql.create_database(name="chuck", instance="chuck-db", exists_ok=False)
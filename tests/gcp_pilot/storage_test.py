@@ -1,8 +1,221 @@
+import io
+import os
+import tempfile
 import unittest
+from unittest.mock import MagicMock, Mock, patch
 
-from gcp_pilot.storage import CloudStorage
+from google.oauth2.service_account import Credentials as ServiceAccountCredentials
+
+from gcp_pilot.storage import HTTP_POOL_SIZE, PARALLEL_UPLOAD_THRESHOLD, CloudStorage
 from tests import ClientTestMixin
 
 
 class TestCloudStorage(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = CloudStorage
+
+    def _upload(self, size: int, **kwargs):
+        storage = self.get_client()
+        with (
+            tempfile.NamedTemporaryFile() as file,
+            patch("gcp_pilot.storage.transfer_manager.upload_chunks_concurrently") as upload_concurrently,
+            patch("gcp_pilot.storage.Blob.upload_from_filename") as upload_from_filename,
+            patch("gcp_pilot.storage.Blob.make_public") as self.make_public,
+        ):
+            file.truncate(size)
+            blob = storage.upload(source_file=file.name, bucket_name="chuck", max_workers=4, **kwargs)
+        return blob, upload_concurrently, upload_from_filename
+
+    def test_upload_small_file(self):
+        _, upload_concurrently, upload_from_filename = self._upload(size=1024)
+
+        upload_concurrently.assert_not_called()
+        upload_from_filename.assert_called_once()
+
+    def test_upload_public_file(self):
+        _, _, upload_from_filename = self._upload(size=1024, is_public=True)
+
+        self.assertEqual("publicRead", upload_from_filename.call_args.kwargs["predefined_acl"])
+        self.make_public.assert_not_called()
+
+    def test_upload_large_public_file(self):
+        _, upload_concurrently, _ = self._upload(size=PARALLEL_UPLOAD_THRESHOLD + 1, is_public=True)
+
+        upload_concurrently.assert_called_once()
+        self.make_public.assert_called_once()
+
+    def test_upload_large_file_concurrently(self):
+        blob, upload_concurrently, upload_from_filename = self._upload(size=PARALLEL_UPLOAD_THRESHOLD + 1)
+
+        upload_from_filename.assert_not_called()
+        upload_concurrently.assert_called_once()
+        self.assertIs(blob, upload_concurrently.call_args.args[1])
+        self.assertEqual(4, upload_concurrently.call_args.kwargs["max_workers"])
+        self.assertEqual("thread", upload_concurrently.call_args.kwargs["worker_type"])
+
+    def test_upload_with_custom_threshold(self):
+        chunk_size = 256 * 1024
+        _, upload_concurrently, upload_from_filename = self._upload(
+            size=4 * chunk_size,
+            parallel_threshold=2 * chunk_size,
+            chunk_size=chunk_size,
+        )
+
+        upload_from_filename.assert_not_called()
+        self.assertEqual(chunk_size, upload_concurrently.call_args.kwargs["chunk_size"])
+
+    def test_upload_file_object_with_known_size(self):
+        storage = self.get_client()
+        file_obj = io.BytesIO(b"chuck norris")
+        file_obj.seek(6)
+
+        with patch("gcp_pilot.storage.Blob.upload_from_file") as upload_from_file:
+            storage.upload(source_file=file_obj, bucket_name="chuck", target_file_name="norris.txt")
+
+        self.assertEqual(6, upload_from_file.call_args.kwargs["size"])
+        self.assertEqual(6, file_obj.tell())
+
+    def test_upload_unseekable_file_object(self):
+        storage = self.get_client()
+        read_end, write_end = os.pipe()
+        os.close(write_end)
+
+        with (
+            os.fdopen(read_end, "rb", buffering=0) as file_obj,
+            patch("gcp_pilot.storage.Blob.upload_from_file") as upload_from_file,
+        ):
+            storage.upload(source_file=file_obj, bucket_name="chuck", target_file_name="norris.txt")
+
+        self.assertIsNone(upload_from_file.call_args.kwargs["size"])
+
+    def test_upload_from_url_is_streamed(self):
+        content = b"chuck norris" * 1000
+        response = Mock(**{"iter_content.return_value": iter([content[:5000], content[5000:]])})
+        response.__enter__ = Mock(return_value=response)
+        response.__exit__ = Mock(return_value=False)
+        uploaded = {}
+
+        def upload_from_file(file_obj, content_type, size, predefined_acl):
+            uploaded.update(content=file_obj.read(), size=size)
+
+        storage = self.get_client()
+        with (
+            patch("gcp_pilot.storage.requests.get", return_value=response) as get,
+            patch("gcp_pilot.storage.Blob.upload_from_file", side_effect=upload_from_file),
+        ):
+            storage.upload(source_file="https://chuck.norris.com/facts.txt", bucket_name="chuck")
+
+        get.assert_called_once_with("https://chuck.norris.com/facts.txt", stream=True, timeout=15)
+        response.__exit__.assert_called_once()
+        self.assertEqual({"content": content, "size": len(content)}, uploaded)
+
+    def test_upload_does_not_fetch_bucket(self):
+        storage = self.get_client()
+        with (
+            patch.object(storage.client, "get_bucket") as get_bucket,
+            patch("gcp_pilot.storage.Blob.upload_from_string") as upload_from_string,
+        ):
+            blob = storage.upload(source_file=b"chuck", bucket_name="chuck", target_file_name="norris.txt")
+
+        get_bucket.assert_not_called()
+        upload_from_string.assert_called_once()
+        self.assertEqual("gs://chuck/norris.txt", storage.get_uri(blob))
+
+    def test_upload_text_content(self):
+        storage = self.get_client()
+        with patch("gcp_pilot.storage.Blob.upload_from_string") as upload_from_string:
+            storage.upload(source_file="chuck nörris", bucket_name="chuck", target_file_name="norris.txt")
+
+        upload_from_string.assert_called_once_with(data="chuck nörris".encode(), content_type=None, predefined_acl=None)
+
+    def test_download_many(self):
+        storage = self.get_client()
+        blobs = []
+        for name in ("chuck/", "chuck/norris.txt", "chuck/walker.txt"):
+            blob = Mock()
+            blob.name = name
+            blobs.append(blob)
+
+        with (
+            patch.object(CloudStorage, "list_files", return_value=iter(blobs)) as list_files,
+            patch("gcp_pilot.storage.transfer_manager.download_many_to_path") as download_many,
+        ):
+            downloaded = storage.download_many(bucket_name="chuck", prefix="chuck/", destination_directory="/tmp/chuck")
+
+        list_files.assert_called_once_with(bucket_name="chuck", prefix="chuck/", fields="items(name),nextPageToken")
+        self.assertEqual(["chuck/norris.txt", "chuck/walker.txt"], downloaded)
+        self.assertEqual("chuck", download_many.call_args.args[0].name)
+        self.assertEqual(downloaded, download_many.call_args.args[1])
+        self.assertEqual("/tmp/chuck", download_many.call_args.kwargs["destination_directory"])
+        self.assertEqual("thread", download_many.call_args.kwargs["worker_type"])
+
+    def test_list_files(self):
+        storage = self.get_client()
+        with patch.object(storage.client, "list_blobs", return_value=iter([])) as list_blobs:
+            list(storage.list_files(bucket_name="chuck", prefix="norris/", fields="items(name),nextPageToken"))
+
+        list_blobs.assert_called_once_with(
+            "chuck",
+            prefix="norris/",
+            page_size=1000,
+            fields="items(name),nextPageToken",
+        )
+
+    def test_move_many(self):
+        file_names = [(f"chuck-{index}.txt", f"norris-{index}.txt") for index in range(150)]
+        calls = []
+
+        storage = self.get_client()
+        with (
+            patch.object(storage.client, "batch", side_effect=lambda: calls.append("batch") or MagicMock()),
+            patch("gcp_pilot.storage.Bucket.copy_blob", side_effect=lambda *args: calls.append("copy")) as copy_blob,
+            patch("gcp_pilot.storage.Bucket.delete_blob", side_effect=lambda name: calls.append("delete")),
+        ):
+            storage.move_many(file_names=file_names, source_bucket_name="chuck", target_bucket_name="norris")
+
+        expected = ["batch", *["copy"] * 100, "batch", *["delete"] * 100, "batch", *["copy"] * 50, "batch"]
+        self.assertEqual([*expected, *["delete"] * 50], calls)
+        source_blob, target_bucket, target_file_name = copy_blob.call_args.args
+        self.assertEqual(
+            ("chuck-149.txt", "norris", "norris-149.txt"), (source_blob.name, target_bucket.name, target_file_name)
+        )
+
+    def test_check_bucket_is_cached(self):
+        storage = self.get_client(bucket_cache_ttl=60)
+        with (
+            patch.object(storage.client, "get_bucket", side_effect=lambda bucket_or_name: Mock()) as get_bucket,
+            patch("gcp_pilot.storage.time.monotonic", side_effect=[0, 30, 61, 61]),
+        ):
+            bucket = storage.check_bucket(name="chuck")
+            self.assertIs(bucket, storage.check_bucket(name="chuck"))
+            self.assertIsNot(bucket, storage.check_bucket(name="chuck"))
+
+        self.assertEqual(2, get_bucket.call_count)
+
+    def test_http_pool_fits_workers(self):
+        storage = self.get_client()
+
+        adapter = storage.client._http.get_adapter("https://storage.googleapis.com")
+        self.assertEqual(HTTP_POOL_SIZE, adapter._pool_maxsize)
+
+    def test_get_download_urls_signed_with_iam(self):
+        storage = self.get_client()
+        with (
+            patch.object(CloudStorage, "token", "tk-chuck"),
+            patch("gcp_pilot.storage.Blob.generate_signed_url", return_value="https://signed") as generate_signed_url,
+        ):
+            urls = storage.get_download_urls(bucket_name="chuck", blob_names=["norris.txt", "walker.txt"])
+
+        self.assertEqual({"norris.txt": "https://signed", "walker.txt": "https://signed"}, urls)
+        self.assertEqual(2, generate_signed_url.call_count)
+        self.assertEqual("tk-chuck", generate_signed_url.call_args.kwargs["access_token"])
+        self.assertEqual("chuck@norris.com", generate_signed_url.call_args.kwargs["service_account_email"])
+
+    def test_get_download_url_signed_locally(self):
+        storage = self.get_client()
+        storage.credentials = Mock(spec=ServiceAccountCredentials)
+        with patch("gcp_pilot.storage.Blob.generate_signed_url", return_value="https://signed") as generate_signed_url:
+            url = storage.get_download_url(bucket_name="chuck", blob_name="norris.txt")
+
+        self.assertEqual("https://signed", url)
+        self.assertIs(storage.credentials, generate_signed_url.call_args.kwargs["credentials"])
+        self.assertNotIn("access_token", generate_signed_url.call_args.kwargs)
@@ -1,8 +1,101 @@
 import unittest
+from unittest.mock import patch
 
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition, PermissionDenied
+from google.cloud import tasks_v2
+
+from gcp_pilot import exceptions
 from gcp_pilot.tasks import CloudTasks
 from tests import ClientTestMixin
 
 
 class TestCloudTasks(ClientTestMixin, unittest.TestCase):
     _CLIENT_KLASS = CloudTasks
+
+    def test_list_tasks(self):
+        tasks = self.get_client(location="moon-dark1")
+        with patch.object(tasks.client, "list_tasks", return_value=iter([])) as list_tasks:
+            list(tasks.list_tasks(queue_name="chuck", page_size=100, response_view=tasks_v2.Task.View.FULL))
+
+        request = list_tasks.call_args.kwargs["request"]
+        self.assertEqual("projects/potato-dev/locations/moon-dark1/queues/chuck", request.parent)
+        self.assertEqual(100, request.page_size)
+        self.assertEqual(tasks_v2.Task.View.FULL, request.response_view)
+
+    def test_push_many(self):
+        pushes = [
+            {"queue_name": "chuck", "url": "https://chuck.norris.com", "payload": "{}", "task_name": "kick"},
+            {"queue_name": "chuck", "url": "https://chuck.norris.com", "payload": "{}", "task_name": "punch"},
+        ]
+        attempts = []
+
+        def create_task(parent, task):
+            # every task is pushed to a missing queue at first, so both threads try to create it
+            attempts.append(task.name)
+            if attempts.count(task.name) == 1:
+                raise FailedPrecondition("Queue does not exist.")
+            return task
+
+        tasks = self.get_client(location="moon-dark1")
+        with (
+            patch.object(tasks.client, "create_task", side_effect=create_task),
+            patch.object(tasks.client, "create_queue", side_effect=[None, AlreadyExists("")]) as create_queue,
+        ):
+            created = tasks.push_many(tasks=pushes, max_workers=2)
+
+        self.assertEqual(4, len(attempts))
+        self.assertEqual(2, create_queue.call_count)
+        queue_path = "projects/potato-dev/locations/moon-dark1/queues/chuck"
+        self.assertRegex(created[0].name, f"^{queue_path}/tasks/kick-[0-9a-f]{{32}}$")
+        self.assertRegex(created[1].name, f"^{queue_path}/tasks/punch-[0-9a-f]{{32}}$")
+
+    def test_push_many_with_failures(self):
+        pushes = [
+            {"queue_name": "chuck", "url": "https://chuck.norris.com", "payload": "{}", "task_name": "kick"},
+            {"queue_name": "chuck", "url": "https://chuck.norris.com", "payload": "{}", "task_name": "punch"},
+            {"queue_name": "chuck", "url": "https://chuck.norris.com", "payload": "{}", "task_name": "block"},
+        ]
+        error = PermissionDenied("")
+
+        def create_task(parent, task):
+            if "/tasks/punch-" in task.name:
+                raise error
+            return task
+
+        tasks = self.get_client(location="moon-dark1")
+        with (
+            patch.object(tasks.client, "create_task", side_effect=create_task) as create_task_mock,
+            self.assertRaises(exceptions.BatchError) as context,
+        ):
+            tasks.push_many(tasks=pushes, max_workers=2)
+
+        self.assertEqual(3, create_task_mock.call_count)
+        self.assertEqual({1: error}, context.exception.errors)
+        self.assertEqual([0, 2], sorted(context.exception.results))
+
+    def test_push_keeps_headers(self):
+        headers = {"X-Chuck": "norris"}
+
+        tasks = self.get_client(location="moon-dark1")
+        with patch.object(tasks.client, "create_task", side_effect=lambda parent, task: task):
+            task = tasks.push(
+                queue_name="chuck",
+                url="https://chuck.norris.com",
+                payload=b"{}",
+                content_type="application/json",
+                headers=headers,
+            )
+
+        self.assertEqual({"X-Chuck": "norris"}, headers)
+        self.assertEqual({"X-Chuck": "norris", "Content-Type": "application/json"}, dict(task.http_request.headers))
+        self.assertEqual(b"{}", task.http_request.body)
+
+    def test_push_with_delay(self):
+        tasks = self.get_client(location="moon-dark1")
+        with (
+            patch("gcp_pilot.tasks.time.time", return_value=1_700_000_000.75),
+            patch.object(tasks.client, "create_task", side_effect=lambda parent, task: task),
+        ):
+            task = tasks.push(queue_name="chuck", url="https://chuck.norris.com", delay_in_seconds=60)
+
+        self.assertEqual(1_700_000_060, task.schedule_time.timestamp())